@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class ApiViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+        cls.user = User.objects.create(username='User')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Пост {i}', group=cls.group)
+            for i in range(15)
+        )
+        cls.post = Post.objects.filter(author=cls.author).first()
+        Comment.objects.create(
+            post=cls.post, author=cls.user, text='Комментарий')
+        Follow.objects.create(user=cls.user, author=cls.author)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_index_cursor_pagination(self):
+        """Курсор отдаёт следующую порцию постов без повторов."""
+        response = self.client.get(reverse('api:index'))
+        data = response.json()
+        self.assertEqual(len(data['results']), 10)
+        self.assertIsNotNone(data['next'])
+        response = self.client.get(
+            reverse('api:index'), {'cursor': data['next']})
+        next_data = response.json()
+        self.assertEqual(len(next_data['results']), 5)
+        self.assertIsNone(next_data['next'])
+        ids = {post['id'] for post in data['results'] + next_data['results']}
+        self.assertEqual(len(ids), 15)
+
+    def test_sparse_fieldsets(self):
+        """Параметр fields ограничивает набор полей."""
+        response = self.client.get(
+            reverse('api:index'), {'fields': 'id,author'})
+        self.assertEqual(
+            set(response.json()['results'][0]), {'id', 'author'})
+        self.assertEqual(
+            response.json()['results'][0]['author'], self.author.username)
+
+    def test_bad_params_return_400(self):
+        """Неизвестные поля и битый курсор возвращают 400."""
+        for params in ({'fields': 'password'}, {'cursor': '!!!'}):
+            with self.subTest(params=params):
+                response = self.client.get(reverse('api:index'), params)
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_group_profile_and_detail(self):
+        """Эндпоинты группы, профиля и поста отдают корректные данные."""
+        response = self.client.get(
+            reverse('api:group_list', kwargs={'slug': self.group.slug}))
+        self.assertEqual(response.json()['group']['slug'], self.group.slug)
+        response = self.client.get(
+            reverse('api:profile', kwargs={'username': 'Author'}))
+        self.assertEqual(response.json()['author']['username'], 'Author')
+        response = self.client.get(
+            reverse('api:post_detail', kwargs={'post_id': self.post.pk}))
+        self.assertEqual(response.json()['id'], self.post.pk)
+        self.assertEqual(
+            response.json()['comments'][0]['author'], self.user.username)
+
+    def test_missing_objects_return_404(self):
+        """Несуществующие объекты возвращают 404."""
+        urls = [
+            reverse('api:group_list', kwargs={'slug': 'missing'}),
+            reverse('api:profile', kwargs={'username': 'missing'}),
+            reverse('api:post_detail', kwargs={'post_id': 0}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_follow_index(self):
+        """Лента подписок доступна только авторизованному пользователю."""
+        response = self.client.get(reverse('api:follow_index'))
+        self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+        response = self.authorized_client.get(reverse('api:follow_index'))
+        self.assertEqual(len(response.json()['results']), 10)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_etag_not_modified(self):
+        """Повторный запрос с ETag получает 304."""
+        response = self.client.get(reverse('api:index'))
+        self.assertIn('max-age', response['Cache-Control'])
+        response = self.client.get(
+            reverse('api:index'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
@@ -0,0 +1,84 @@
+import hashlib
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, quote_etag,
+)
+
+from posts.utilis import after_cursor, encode_cursor
+
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'group': 'group__slug',
+    'image': 'image',
+}
+
+
+class ApiError(Exception):
+    def __init__(self, detail, status=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status = status
+
+
+def get_fields(request):
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(POST_FIELDS)
+    fields = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in POST_FIELDS]
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(unknown)}')
+    return fields
+
+
+def serialize_post(post, fields):
+    return {name: post[POST_FIELDS[name]] for name in fields}
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', settings.FIRST_PAGE_POSTS))
+    except ValueError:
+        raise ApiError('Параметр limit должен быть числом')
+    return max(1, min(limit, settings.API_MAX_LIMIT))
+
+
+def get_cursor_page(posts, request):
+    fields = get_fields(request)
+    limit = get_limit(request)
+    try:
+        posts = after_cursor(posts, request.GET.get('cursor'))
+    except ValueError as error:
+        raise ApiError(str(error))
+    lookups = {POST_FIELDS[name] for name in fields} | {'id', 'pub_date'}
+    rows = list(posts.values(*lookups)[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['pub_date'], rows[-1]['id'])
+    return {
+        'results': [serialize_post(row, fields) for row in rows],
+        'next': next_cursor,
+    }
+
+
+def json_response(request, data, private=False, status=200):
+    response = JsonResponse(
+        data, status=status, json_dumps_params={'ensure_ascii': False})
+    if status != 200:
+        patch_cache_control(response, no_store=True)
+        return response
+    etag = quote_etag(hashlib.md5(response.content).hexdigest())
+    response['ETag'] = etag
+    if private:
+        patch_cache_control(
+            response, private=True, max_age=settings.API_CACHE_TIMEOUT)
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.API_CACHE_TIMEOUT)
+    return get_conditional_response(request, etag=etag, response=response)
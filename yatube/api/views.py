@@ -0,0 +1,77 @@
+from functools import wraps
+
+from posts.models import Comment, Group, Post, User
+
+from .utilis import (
+    POST_FIELDS, ApiError, get_cursor_page, get_fields, json_response,
+    serialize_post,
+)
+
+
+def api_view(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return json_response(
+                request, {'detail': error.detail}, status=error.status)
+    return wrapper
+
+
+@api_view
+def index(request):
+    return json_response(request, get_cursor_page(Post.objects.all(), request))
+
+
+@api_view
+def group_posts(request, slug):
+    group = Group.objects.filter(slug=slug).values(
+        'title', 'slug', 'description').first()
+    if group is None:
+        raise ApiError('Группа не найдена', status=404)
+    data = get_cursor_page(Post.objects.filter(group__slug=slug), request)
+    data['group'] = group
+    return json_response(request, data)
+
+
+@api_view
+def profile(request, username):
+    author = User.objects.filter(username=username).values(
+        'username', 'first_name', 'last_name').first()
+    if author is None:
+        raise ApiError('Пользователь не найден', status=404)
+    data = get_cursor_page(
+        Post.objects.filter(author__username=username), request)
+    data['author'] = author
+    return json_response(request, data)
+
+
+@api_view
+def post_detail(request, post_id):
+    fields = get_fields(request)
+    post = Post.objects.filter(pk=post_id).values(
+        *{POST_FIELDS[name] for name in fields}).first()
+    if post is None:
+        raise ApiError('Пост не найден', status=404)
+    data = serialize_post(post, fields)
+    comments = Comment.objects.filter(post_id=post_id).order_by(
+        'created').values('author__username', 'text', 'created')
+    data['comments'] = [
+        {
+            'author': comment['author__username'],
+            'text': comment['text'],
+            'created': comment['created'],
+        }
+        for comment in comments
+    ]
+    return json_response(request, data)
+
+
+@api_view
+def follow_index(request):
+    if not request.user.is_authenticated:
+        raise ApiError('Требуется авторизация', status=401)
+    data = get_cursor_page(
+        Post.objects.filter(author__following__user=request.user), request)
+    return json_response(request, data, private=True)
@@ -1,5 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from .templating import install_render_hook, precompile_templates
+        # Обёртка Template.render нужна только профилированию и
+        # preload-заголовкам; без них рендер идёт напрямую.
+        if (settings.TEMPLATE_PROFILING
+                or 'core.middleware.PreloadMiddleware' in settings.MIDDLEWARE):
+            install_render_hook()
+        if settings.TEMPLATE_PRECOMPILE:
+            precompile_templates()
@@ -0,0 +1,7 @@
+from posts.unread import unread_count
+
+
+def unread(request):
+    if not request.user.is_authenticated:
+        return {}
+    return {'unread_posts': lambda: unread_count(request.user)}
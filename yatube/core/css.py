@@ -0,0 +1,104 @@
+import re
+
+TOKEN_RE = re.compile(r'[A-Za-z][\w-]*')
+TAG_RE = re.compile(r'<([A-Za-z][\w-]*)')
+CLASS_RE = re.compile(r'\.(-?[A-Za-z_][\w-]*)')
+PARENS_RE = re.compile(r'\([^()]*\)')
+COMPOUND_RE = re.compile(r'[\s>+~]+')
+TYPE_RE = re.compile(r'^([A-Za-z][\w-]*)')
+ALWAYS_TAGS = {'html', 'body'}
+NESTED_AT_RULES = ('@media', '@supports')
+
+
+def template_usage(texts):
+    tokens, tags = set(), set(ALWAYS_TAGS)
+    for text in texts:
+        tokens.update(TOKEN_RE.findall(text))
+        tags.update(tag.lower() for tag in TAG_RE.findall(text))
+    return tokens, tags
+
+
+def skip_string(css, index):
+    quote = css[index]
+    index += 1
+    while index < len(css) and css[index] != quote:
+        index += 2 if css[index] == '\\' else 1
+    return index + 1
+
+
+def find_block_end(css, index):
+    depth = 0
+    while index < len(css):
+        char = css[index]
+        if char in '"\'':
+            index = skip_string(css, index)
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return index
+        index += 1
+    raise ValueError('Незакрытый блок в CSS')
+
+
+def split_rules(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    index = 0
+    while index < len(css):
+        match = re.compile(r'[;{]').search(css, index)
+        if match is None:
+            break
+        prelude = css[index:match.start()].strip()
+        if match.group() == ';':
+            yield prelude, None
+            index = match.end()
+            continue
+        end = find_block_end(css, match.start())
+        yield prelude, css[match.end():end]
+        index = end + 1
+
+
+def split_selectors(prelude):
+    selectors, depth, current = [], 0, ''
+    for char in prelude:
+        depth += (char == '(') - (char == ')')
+        if char == ',' and depth == 0:
+            selectors.append(current)
+            current = ''
+        else:
+            current += char
+    return selectors + [current]
+
+
+def selector_used(selector, tokens, tags):
+    while PARENS_RE.search(selector):
+        selector = PARENS_RE.sub('', selector)
+    if not set(CLASS_RE.findall(selector)) <= tokens:
+        return False
+    for compound in COMPOUND_RE.split(selector.strip()):
+        match = TYPE_RE.match(compound)
+        if match and match.group(1).lower() not in tags:
+            return False
+    return True
+
+
+def purge(css, tokens, tags):
+    output = []
+    for prelude, block in split_rules(css):
+        if block is None:
+            output.append(prelude + ';')
+        elif prelude.startswith(NESTED_AT_RULES):
+            inner = purge(block, tokens, tags)
+            if inner:
+                output.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            output.append(f'{prelude}{{{block}}}')
+        else:
+            selectors = [
+                selector for selector in split_selectors(prelude)
+                if selector_used(selector, tokens, tags)]
+            if selectors:
+                output.append(f'{",".join(selectors)}{{{block}}}')
+    return ''.join(output)
@@ -0,0 +1,30 @@
+import re
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+HOLE_RE = re.compile(r'<!--hole:([\w-]+)-->')
+
+
+def placeholder(name):
+    return f'<!--hole:{name}-->'
+
+
+def hole_context(request):
+    # Контекст дыры строится только на сервере: из тела ответа берётся
+    # одно имя, поэтому подделать параметры через контент нельзя.
+    return {
+        'view_name': getattr(request.resolver_match, 'view_name', None),
+    }
+
+
+def fill_holes(request, content):
+    context = hole_context(request)
+
+    def fill(match):
+        template_name = settings.HOLES.get(match.group(1))
+        if template_name is None:
+            return match.group(0)
+        return render_to_string(template_name, context, request)
+
+    return HOLE_RE.sub(fill, content)
@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Замеряет пропускную способность главной страницы для '
+            'авторизованного пользователя с каждым хранилищем сессий; '
+            'данные создаются в транзакции и откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument(
+            '--engines', nargs='+', choices=sorted(settings.SESSION_ENGINES),
+            default=sorted(settings.SESSION_ENGINES))
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create(username='sessions-benchmark')
+            for name in options['engines']:
+                with override_settings(
+                        SESSION_ENGINE=settings.SESSION_ENGINES[name]):
+                    self.run(name, user, options['requests'])
+            transaction.set_rollback(True)
+
+    def run(self, name, user, count):
+        cache.clear()
+        client = Client()
+        client.force_login(user)
+        url = reverse('posts:index')
+        client.get(url)
+        for label, cached in (('из кэша', True), ('рендер', False)):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for number in range(count):
+                    # Уникальная строка запроса обходит кэш страницы,
+                    # но не кэш сессий.
+                    client.get(url, {} if cached else {'n': number})
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{name}, {label}: {count / elapsed:.0f} запросов/с, '
+                f'{len(queries) / count:.1f} SQL на запрос')
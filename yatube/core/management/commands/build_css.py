@@ -0,0 +1,66 @@
+import glob
+import gzip
+import os
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.css import purge, template_usage
+
+CRITICAL_TEMPLATE = '{{% verbatim %}}<style>{}</style>{{% endverbatim %}}\n'
+BANNER_RE = re.compile(r'/\*!.*?\*/', re.S)
+
+
+def read(path):
+    with open(path, encoding='utf-8') as file:
+        return file.read()
+
+
+def write(path, content):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(content)
+
+
+class Command(BaseCommand):
+    help = ('Вырезает из стилей неиспользуемые в шаблонах правила и '
+            'встраивает критический CSS в base.html')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Не записывать файлы, только показать размеры')
+
+    def usage(self, paths):
+        tokens, tags = template_usage(read(path) for path in paths)
+        safelist = set(settings.CSS_SAFELIST)
+        return tokens | safelist, tags | safelist
+
+    def size(self, label, css):
+        data = css.encode()
+        self.stdout.write(
+            f'{label}: {len(data)} байт, '
+            f'{len(gzip.compress(data))} байт в gzip')
+
+    def handle(self, *args, **options):
+        templates_dir = settings.TEMPLATES[0]['DIRS'][0]
+        static_dir = settings.STATICFILES_DIRS[0]
+        critical_path = os.path.join(
+            templates_dir, settings.CSS_CRITICAL_OUTPUT)
+        css = read(os.path.join(static_dir, settings.CSS_SOURCE))
+        purged = purge(css, *self.usage(
+            path for path in glob.glob(
+                os.path.join(templates_dir, '**', '*.html'), recursive=True)
+            if path != critical_path))
+        _, charset, rules = purged.rpartition('@charset "UTF-8";')
+        purged = charset + ''.join(BANNER_RE.findall(css)) + rules
+        critical = purge(purged, *self.usage(
+            os.path.join(templates_dir, name)
+            for name in settings.CSS_CRITICAL_TEMPLATES))
+        self.size('Исходный', css)
+        self.size('Очищенный', purged)
+        self.size('Критический', critical)
+        if options['check']:
+            return
+        write(os.path.join(static_dir, settings.CSS_PURGED), purged)
+        write(critical_path, CRITICAL_TEMPLATE.format(critical))
@@ -0,0 +1,34 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = ('Удаляет просроченные сессии пачками, не блокируя таблицу '
+            'одним большим DELETE; запускается по расписанию')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch', type=int, default=settings.SESSION_CLEANUP_BATCH)
+        parser.add_argument('--pause', type=float, default=0)
+
+    def handle(self, *args, **options):
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not hasattr(store, 'get_model_class'):
+            self.stdout.write('Сессии не хранятся в базе данных')
+            return
+        model = store.get_model_class()
+        expired = model.objects.filter(expire_date__lt=timezone.now())
+        removed = 0
+        while True:
+            keys = list(expired.values_list(
+                'session_key', flat=True)[:options['batch']])
+            if not keys:
+                break
+            model.objects.filter(session_key__in=keys).delete()
+            removed += len(keys)
+            time.sleep(options['pause'])
+        self.stdout.write(f'Удалено сессий: {removed}')
@@ -0,0 +1,172 @@
+import copy
+import hashlib
+
+from django.conf import settings
+from django.contrib.sessions import middleware
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import get_max_age, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .encoding import ENCODINGS, accepted_encodings, compress, compress_stream
+from .holes import fill_holes
+from .preload import preload_links
+from .templating import rendered, server_timing, timings
+
+
+class SnapshotSessionMixin:
+    def load(self):
+        data = super().load()
+        # Копия загруженных данных нужна, чтобы в конце запроса сравнить
+        # с ней сессию без повторного чтения из хранилища.
+        self.loaded_data = copy.deepcopy(data)
+        return data
+
+
+class SessionMiddleware(middleware.SessionMiddleware):
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.SessionStore = type(
+            'SessionStore', (SnapshotSessionMixin, self.SessionStore), {})
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if (settings.SESSION_SKIP_UNCHANGED and session is not None
+                and session.modified and self.unchanged(request, session)):
+            session.modified = False
+        return super().process_response(request, response)
+
+    def unchanged(self, request, session):
+        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if session_key is None or session.session_key != session_key:
+            return False
+        loaded = getattr(session, 'loaded_data', None)
+        return loaded is not None and loaded == session._session
+
+
+class TemplateTimingMiddleware:
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Без cookie сессии сотрудника быть не может, а проверка
+        # request.user добавила бы Vary: Cookie к каждому ответу.
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return self.get_response(request)
+        token = timings.set({})
+        try:
+            response = self.get_response(request)
+            current = timings.get()
+        finally:
+            timings.reset(token)
+        if (current and 'text/html' in response.get('Content-Type', '')
+                and request.user.is_staff):
+            response['Server-Timing'] = server_timing(current)
+        return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        if not self.compressible(request, response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = next((
+            encoding for encoding in ENCODINGS
+            if encoding in accepted_encodings(request)), None)
+        if encoding is None:
+            return response
+        level = settings.COMPRESS_LEVELS[encoding]
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding, level)
+            del response['Content-Length']
+        elif len(response.content) < settings.COMPRESS_MIN_SIZE:
+            return response
+        else:
+            response.content = self.compressed_body(
+                response, encoding, level)
+            response['Content-Length'] = str(len(response.content))
+        etag = response.get('ETag', '')
+        if etag and not etag.startswith('W/'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def compressible(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0]
+        return (
+            response.status_code == 200
+            and not response.has_header('Content-Encoding')
+            and 'no-transform' not in response.get('Cache-Control', '')
+            and content_type in settings.COMPRESS_CONTENT_TYPES
+            # Страницы с CSRF-токеном не сжимаем из-за атаки BREACH.
+            and not (request.META.get('CSRF_COOKIE_USED')
+                     and not settings.COMPRESS_CSRF_PAGES)
+        )
+
+    def compressed_body(self, response, encoding, level):
+        max_age = get_max_age(response)
+        if not max_age:
+            return compress(response.content, encoding, level)
+        key = 'compressed:{}:{}'.format(
+            encoding, hashlib.md5(response.content).hexdigest())
+        body = cache.get(key)
+        if body is None:
+            body = compress(response.content, encoding, level)
+            cache.set(key, body, max_age)
+        return body
+
+
+class HoleMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.streaming
+                or 'text/html' not in response.get('Content-Type', '')
+                or b'<!--hole:' not in response.content):
+            return response
+        response.content = fill_holes(
+            request, response.content.decode(response.charset))
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        return response
+
+
+class PreloadMiddleware(MiddlewareMixin):
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.view_templates = {}
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        names = self.view_templates.get(view_name, [])
+        early_hints = request.META.get('wsgi.early_hints')
+        if names and callable(early_hints):
+            early_hints([('Link', preload_links(names))])
+        request.preload = (view_name, rendered.set([]))
+
+    def process_response(self, request, response):
+        if not hasattr(request, 'preload'):
+            return response
+        view_name, token = request.preload
+        names = self.view_templates.get(view_name, [])
+        try:
+            if (response.status_code == 200
+                    and 'text/html' in response.get('Content-Type', '')):
+                # Ответ из cache_page рендерит только дыры, поэтому имена
+                # шаблонов вьюхи накапливаются между запросами; страницы
+                # ошибок в список не попадают.
+                names = self.view_templates[view_name] = list(
+                    dict.fromkeys(names + rendered.get())
+                )[:settings.PRELOAD_VIEW_TEMPLATES]
+                links = preload_links(names)
+                if links:
+                    response['Link'] = ', '.join(
+                        filter(None, (response.get('Link'), links)))
+        finally:
+            rendered.reset(token)
+        return response
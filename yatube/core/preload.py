@@ -0,0 +1,62 @@
+import os
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, engines
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.templatetags.static import StaticNode
+
+template_assets = {}
+
+
+def constant(expression):
+    if isinstance(expression.var, str) and not expression.filters:
+        return expression.var
+    return None
+
+
+def collect_assets(name, seen=None):
+    if name in template_assets:
+        return template_assets[name]
+    seen = set() if seen is None else seen
+    if name is None or name in seen:
+        return []
+    seen.add(name)
+    try:
+        nodelist = engines['django'].get_template(name).template.nodelist
+    except TemplateDoesNotExist:
+        return []
+    assets = [constant(node.path)
+              for node in nodelist.get_nodes_by_type(StaticNode)]
+    for node in nodelist.get_nodes_by_type(ExtendsNode):
+        assets.extend(collect_assets(constant(node.parent_name), seen))
+    for node in nodelist.get_nodes_by_type(IncludeNode):
+        assets.extend(collect_assets(constant(node.template), seen))
+    assets = list(dict.fromkeys(
+        path for path in assets
+        if path and preload_type(path) is not None))
+    if not settings.DEBUG:
+        template_assets[name] = assets
+    return assets
+
+
+def preload_type(path):
+    return settings.PRELOAD_TYPES.get(os.path.splitext(path)[1].lower())
+
+
+def preload_links(template_names):
+    paths = []
+    for name in template_names:
+        paths.extend(collect_assets(name))
+    priority = list(dict.fromkeys(settings.PRELOAD_TYPES.values()))
+    paths = sorted(
+        dict.fromkeys(paths),
+        key=lambda path: priority.index(preload_type(path)))
+    paths = paths[:settings.PRELOAD_MAX]
+    links = []
+    for path in paths:
+        link = (f'<{StaticNode.handle_simple(path)}>; rel=preload; '
+                f'as={preload_type(path)}')
+        if preload_type(path) == 'font':
+            link += '; crossorigin'
+        links.append(link)
+    return ', '.join(links)
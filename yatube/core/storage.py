@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from .encoding import ENCODINGS, SUFFIXES, compress
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            if not name.endswith(settings.STATIC_COMPRESS_EXTENSIONS):
+                continue
+            for compressed in self.write_compressed(name):
+                yield compressed, compressed, True
+
+    def write_compressed(self, name):
+        with self.open(name) as file:
+            data = file.read()
+        for encoding in ENCODINGS:
+            compressed = compress(
+                data, encoding, settings.STATIC_COMPRESS_LEVELS[encoding])
+            if len(compressed) >= len(data):
+                continue
+            path = name + SUFFIXES[encoding]
+            if self.exists(path):
+                self.delete(path)
+            self._save(path, ContentFile(compressed))
+            yield path
@@ -0,0 +1,21 @@
+from django import template
+from django.urls import reverse
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+
+from posts.hashtags import HASHTAG_RE
+
+register = template.Library()
+
+
+@register.filter(needs_autoescape=True)
+def hashtags(text, autoescape=True):
+    escape = conditional_escape if autoescape else str
+    parts, position = [], 0
+    for match in HASHTAG_RE.finditer(text):
+        url = reverse('posts:tag_posts', args=[match.group(1).lower()])
+        parts.append(escape(text[position:match.start()]))
+        parts.append(f'<a href="{url}">{escape(match.group(0))}</a>')
+        position = match.end()
+    parts.append(escape(text[position:]))
+    return mark_safe(''.join(parts))
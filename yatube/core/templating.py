@@ -0,0 +1,58 @@
+import os
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.template import engines
+from django.template.base import Template
+
+timings = ContextVar('template_timings', default=None)
+rendered = ContextVar('rendered_templates', default=None)
+
+
+def precompile_templates():
+    engine = engines['django']
+    names = []
+    for directory in engine.dirs:
+        for root, _, files in os.walk(directory):
+            names.extend(
+                os.path.relpath(os.path.join(root, name), directory)
+                for name in files if name.endswith('.html'))
+    for name in names:
+        engine.get_template(name.replace(os.sep, '/'))
+    return len(names)
+
+
+def install_render_hook():
+    render = Template.render
+    if getattr(render, 'hooked', False):
+        return
+
+    def hooked_render(self, context):
+        names = rendered.get()
+        current = timings.get()
+        if names is None and current is None:
+            return render(self, context)
+        if names is not None:
+            names.append(self.name)
+        if current is None:
+            return render(self, context)
+        started = perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            count, total = current.get(self.name, (0, 0))
+            current[self.name] = (count + 1, total + perf_counter() - started)
+
+    hooked_render.hooked = True
+    Template.render = hooked_render
+
+
+def server_timing(current):
+    slowest = sorted(
+        current.items(), key=lambda item: item[1][1], reverse=True)
+    return ', '.join(
+        f'tpl{number};desc="{name or "<string>"} x{count}";'
+        f'dur={total * 1000:.2f}'
+        for number, (name, (count, total)) in enumerate(
+            slowest[:settings.TEMPLATE_PROFILE_SIZE]))
@@ -0,0 +1,75 @@
+import gzip
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from ..encoding import brotli
+from ..middleware import CompressionMiddleware
+
+BODY = ('<p>Пост</p>' * 200).encode()
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def process(self, response, encoding='gzip'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip_negotiated(self):
+        """Ответ сжимается gzip, если клиент не знает brotli."""
+        response = self.process(HttpResponse(BODY), 'gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(
+            response['Content-Length'], str(len(response.content)))
+
+    def test_brotli_preferred(self):
+        """При поддержке brotli выбирается он."""
+        if brotli is None:
+            self.skipTest('brotli не установлен')
+        response = self.process(HttpResponse(BODY), 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), BODY)
+
+    def test_skipped_responses(self):
+        """Короткие ответы, неподходящие типы и q=0 не сжимаются."""
+        cases = {
+            'короткий': (HttpResponse(b'short'), 'gzip'),
+            'картинка': (HttpResponse(BODY, content_type='image/png'), 'gzip'),
+            'q=0': (HttpResponse(BODY), 'gzip;q=0'),
+        }
+        for case, (response, encoding) in cases.items():
+            with self.subTest(case=case):
+                response = self.process(response, encoding)
+                self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming(self):
+        """Потоковый ответ сжимается по частям."""
+        response = self.process(StreamingHttpResponse([BODY, BODY]))
+        body = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), BODY * 2)
+
+    def test_cached_page_compressed_once(self):
+        """Тело кэшируемой страницы сжимается один раз."""
+        with mock.patch(
+                'core.middleware.compress', return_value=b'zip') as compress:
+            for _ in range(2):
+                response = HttpResponse(BODY)
+                response['Cache-Control'] = 'max-age=60'
+                self.assertEqual(self.process(response).content, b'zip')
+        compress.assert_called_once()
+
+    def test_csrf_pages_not_compressed(self):
+        """Страница с CSRF-токеном отдаётся без сжатия (BREACH)."""
+        response = self.client.get(
+            reverse('users:login'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.client.get(
+            reverse('posts:index'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
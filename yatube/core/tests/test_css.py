@@ -0,0 +1,47 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from ..css import purge, template_usage
+
+CSS = (
+    '@charset "UTF-8";:root{--x:1}'
+    '.btn,.card{color:red}.unused{color:blue}'
+    '.btn:not(.disabled):hover{color:green}'
+    'table{width:100%}a{color:inherit}'
+    '@media (min-width:576px){.unused{margin:0}.btn{margin:1px}}'
+    '@media print{.unused{display:none}}'
+    '@keyframes spin{to{transform:rotate(360deg)}}'
+)
+TEMPLATE = '<div class="card"><a class="btn">{{ x|addclass:"btn" }}</a></div>'
+
+
+class PurgeCssTests(SimpleTestCase):
+    def purged(self):
+        return purge(CSS, *template_usage([TEMPLATE]))
+
+    def test_unused_rules_removed(self):
+        """Правила для неиспользуемых классов и тегов удаляются."""
+        css = self.purged()
+        self.assertNotIn('.unused', css)
+        self.assertNotIn('table{', css)
+        self.assertNotIn('@media print', css)
+
+    def test_used_rules_kept(self):
+        """Используемые правила, переменные и @-правила сохраняются."""
+        css = self.purged()
+        for fragment in (
+                '@charset "UTF-8";', ':root{--x:1}', '.btn,.card{color:red}',
+                '.btn:not(.disabled):hover', 'a{color:inherit}',
+                '@media (min-width:576px){.btn{margin:1px}}',
+                '@keyframes spin{to{transform:rotate(360deg)}}'):
+            with self.subTest(fragment=fragment):
+                self.assertIn(fragment, css)
+
+    def test_build_reports_sizes(self):
+        """Команда сборки показывает размеры до и после очистки."""
+        out = StringIO()
+        call_command('build_css', check=True, stdout=out)
+        self.assertIn('Очищенный', out.getvalue())
+        self.assertIn('Критический', out.getvalue())
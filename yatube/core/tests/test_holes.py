@@ -0,0 +1,67 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, RequestFactory, TestCase
+from django.urls import resolve, reverse
+
+from posts.models import Post
+
+from ..holes import fill_holes, placeholder
+
+User = get_user_model()
+
+
+class HolePunchingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.first = User.objects.create(username='First')
+        cls.second = User.objects.create(username='Second')
+
+    def setUp(self):
+        cache.clear()
+
+    def get_index(self, user=None):
+        client = Client()
+        if user:
+            client.force_login(user)
+        return client.get(reverse('posts:index'))
+
+    def test_cached_page_shared_between_users(self):
+        """Одна закэшированная страница подходит всем пользователям."""
+        Post.objects.create(author=self.first, text='Первый пост')
+        self.assertContains(self.get_index(self.first), 'Пользователь: First')
+        Post.objects.create(author=self.first, text='Пост после кэша')
+        response = self.get_index(self.second)
+        self.assertNotContains(response, 'Пост после кэша')
+        self.assertContains(response, 'Пользователь: Second')
+        self.assertContains(response, 'Избранные авторы')
+        self.assertNotContains(response, 'Пользователь: First')
+        response = self.get_index()
+        self.assertContains(response, 'Войти')
+        self.assertNotContains(response, 'Избранные авторы')
+
+    def test_only_registered_holes_filled(self):
+        """Неизвестные и экранированные заглушки не заполняются."""
+        request = RequestFactory().get('/')
+        request.user = self.first
+        request.resolver_match = None
+        unknown = placeholder('unknown')
+        self.assertEqual(fill_holes(request, unknown), unknown)
+        Post.objects.create(author=self.first, text=placeholder('header'))
+        response = self.get_index(self.second)
+        self.assertContains(response, '&lt;!--hole:header--&gt;')
+
+    def test_params_not_read_from_body(self):
+        """Параметры дыры не берутся из тела ответа."""
+        request = RequestFactory().get('/')
+        request.user = self.first
+        request.resolver_match = resolve(reverse('posts:trending'))
+        forged = '<!--hole:switcher:eyJpbmRleCI6MX0=-->'
+        content = fill_holes(request, placeholder('switcher') + forged)
+        self.assertIn(forged, content)
+        self.assertEqual(content.count('nav-link active'), 1)
+        self.assertRegex(
+            content, r'active"\s+href="{}"'.format(
+                re.escape(reverse('posts:trending'))))
@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..preload import collect_assets
+
+CSS_LINK = '</static/css/bootstrap.purged.css>; rel=preload; as=style'
+
+
+class PreloadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_assets_follow_template_chain(self):
+        """Ресурсы собираются через extends и include."""
+        assets = collect_assets('posts/index.html')
+        self.assertIn('css/bootstrap.purged.css', assets)
+
+    def test_only_render_blocking_assets(self):
+        """Картинки и иконки не попадают в preload."""
+        assets = collect_assets('posts/index.html')
+        self.assertNotIn('img/logo.png', assets)
+        self.assertNotIn('img/fav/favicon.ico', assets)
+
+    def test_link_header(self):
+        """HTML-ответ содержит Link с preload, стили идут первыми."""
+        for _ in range(2):
+            response = self.client.get(reverse('posts:index'))
+            self.assertTrue(response['Link'].startswith(CSS_LINK))
+            self.assertNotIn('as=image', response['Link'])
+
+    def test_early_hints(self):
+        """Сервер с поддержкой 103 получает подсказки до рендера."""
+        hints = []
+        url = reverse('about:tech')
+        self.client.get(url, **{'wsgi.early_hints': hints.append})
+        self.assertEqual(hints, [])
+        self.client.get(url, **{'wsgi.early_hints': hints.append})
+        self.assertEqual(len(hints), 1)
+        self.assertIn(CSS_LINK, hints[0][0][1])
+
+    def test_error_pages_not_recorded(self):
+        """Шаблоны страницы 404 не запоминаются для вьюхи."""
+        hints = []
+        url = reverse('posts:group_list', args=['missing'])
+        for _ in range(2):
+            response = self.client.get(
+                url, **{'wsgi.early_hints': hints.append})
+            self.assertEqual(response.status_code, 404)
+            self.assertFalse(response.has_header('Link'))
+        self.assertEqual(hints, [])
+
+    def test_no_link_for_json(self):
+        """Не-HTML ответы заголовок не получают."""
+        response = self.client.get(reverse('posts:follow_unread'))
+        self.assertFalse(response.has_header('Link'))
@@ -0,0 +1,59 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from core.middleware import SessionMiddleware
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db')
+class SessionTests(TestCase):
+    def setUp(self):
+        self.middleware = SessionMiddleware()
+        store = self.middleware.SessionStore()
+        store['theme'] = 'dark'
+        store.create()
+        self.session_key = store.session_key
+
+    def respond(self, value):
+        request = RequestFactory().get('/')
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = self.session_key
+        self.middleware.process_request(request)
+        request.session['theme'] = value
+        return self.middleware.process_response(request, HttpResponse())
+
+    def test_unchanged_session_not_saved(self):
+        """Сессия с прежними данными не перезаписывается."""
+        response = self.respond('dark')
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    def test_unchanged_check_does_not_reload(self):
+        """Проверка сравнивает со снимком, а не читает сессию заново."""
+        with self.assertNumQueries(1):
+            self.respond('dark')
+
+    def test_changed_session_saved(self):
+        """Изменённая сессия сохраняется и обновляет cookie."""
+        response = self.respond('light')
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        store = self.middleware.SessionStore(self.session_key)
+        self.assertEqual(store['theme'], 'light')
+
+    def test_clear_expired_sessions(self):
+        """Просроченные сессии удаляются пачками, живые остаются."""
+        expired = timezone.now() - timedelta(days=1)
+        Session.objects.bulk_create(
+            Session(session_key=f'expired{number}', session_data='',
+                    expire_date=expired)
+            for number in range(5))
+        out = StringIO()
+        call_command('clear_expired_sessions', batch=2, stdout=out)
+        self.assertIn('Удалено сессий: 5', out.getvalue())
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            [self.session_key])
@@ -0,0 +1,71 @@
+import gzip
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..encoding import brotli
+from ..views import static_asset
+
+CSS = 'css/bootstrap.min.css'
+
+
+class StaticPipelineTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.TemporaryDirectory()
+        cls.settings = override_settings(
+            STATIC_ROOT=cls.root.name,
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'),
+            STATICFILES_FINDERS=[
+                'django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        cls.settings.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.hashed = staticfiles_storage.stored_name(CSS)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        cls.root.cleanup()
+        super().tearDownClass()
+
+    def get(self, path, encoding=''):
+        request = RequestFactory().get(
+            settings.STATIC_URL + path, HTTP_ACCEPT_ENCODING=encoding)
+        return static_asset(request, path)
+
+    def test_manifest_used_by_static_tag(self):
+        """Тег static подставляет имя с хэшем из манифеста."""
+        url = Template('{% load static %}{% static "' + CSS + '" %}').render(
+            Context())
+        self.assertNotEqual(self.hashed, CSS)
+        self.assertEqual(url, settings.STATIC_URL + self.hashed)
+
+    def test_precompressed_copies(self):
+        """Рядом с файлом лежат сжатые копии."""
+        self.assertTrue(staticfiles_storage.exists(self.hashed + '.gz'))
+        self.assertEqual(
+            staticfiles_storage.exists(self.hashed + '.br'), bool(brotli))
+
+    def test_serves_precompressed_immutable(self):
+        """Хэшированный файл отдаётся сжатым и кэшируется навсегда."""
+        response = self.get(self.hashed, 'gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        body = gzip.decompress(b''.join(response.streaming_content))
+        with staticfiles_storage.open(self.hashed) as file:
+            self.assertEqual(body, file.read())
+
+    def test_unhashed_not_immutable(self):
+        """Файл без хэша отдаётся без сжатия и без immutable."""
+        response = self.get(CSS, 'identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Cache-Control'))
+        response.close()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.template import TemplateSyntaxError
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..templating import install_render_hook, precompile_templates
+
+User = get_user_model()
+
+
+@override_settings(TEMPLATE_PROFILING=True)
+class TemplateProfilingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        install_render_hook()
+        cls.staff = User.objects.create(username='Staff', is_staff=True)
+        cls.user = User.objects.create(username='User')
+
+    def setUp(self):
+        cache.clear()
+
+    def get_index(self, user):
+        client = Client()
+        client.force_login(user)
+        return client.get(reverse('posts:group_index'))
+
+    def test_staff_sees_breakdown(self):
+        """Сотрудник получает время рендера шаблонов в Server-Timing."""
+        timing = self.get_index(self.staff)['Server-Timing']
+        self.assertIn('posts/groups.html', timing)
+        self.assertIn('dur=', timing)
+
+    def test_user_without_breakdown(self):
+        """Обычный пользователь заголовок не получает."""
+        self.assertFalse(self.get_index(self.user).has_header('Server-Timing'))
+
+    def test_user_not_checked_needlessly(self):
+        """Без cookie сессии и для не-HTML пользователь не проверяется."""
+        staff = Client()
+        staff.force_login(self.staff)
+        for client in (Client(), staff):
+            with self.subTest(client=client):
+                response = client.get(reverse('posts:sitemap'))
+                self.assertFalse(response.has_header('Server-Timing'))
+                self.assertNotIn('Cookie', response.get('Vary', ''))
+
+    @override_settings(TEMPLATE_PROFILING=False)
+    def test_profiling_disabled(self):
+        """С выключенным профилированием заголовка нет и у сотрудника."""
+        self.assertFalse(
+            self.get_index(self.staff).has_header('Server-Timing'))
+
+
+class PrecompileTests(TestCase):
+    def test_all_templates_compile(self):
+        """Все шаблоны проекта компилируются без ошибок."""
+        self.assertGreater(precompile_templates(), 0)
+
+    def test_syntax_error_fails(self):
+        """Синтаксическая ошибка в шаблоне прерывает прекомпиляцию."""
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'broken.html'), 'w') as file:
+                file.write('{% if %}')
+            templates = [{
+                'BACKEND': 'django.template.backends.django.DjangoTemplates',
+                'DIRS': [directory],
+            }]
+            with override_settings(TEMPLATES=templates):
+                with self.assertRaises(TemplateSyntaxError):
+                    precompile_templates()
@@ -0,0 +1,96 @@
+import hashlib
+import re
+import zlib
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import LshBucket, PostSignature
+
+TOKEN_RE = re.compile(r'\w+')
+PRIME = (1 << 31) - 1
+SHINGLE_SIZE = 3
+
+_random = np.random.RandomState(20230129)
+PERMUTATIONS = (
+    _random.randint(1, PRIME, settings.MINHASH_PERMUTATIONS, dtype=np.uint64),
+    _random.randint(0, PRIME, settings.MINHASH_PERMUTATIONS, dtype=np.uint64),
+)
+
+
+def shingles(text):
+    tokens = TOKEN_RE.findall(text.lower())
+    return {
+        ' '.join(tokens[start:start + SHINGLE_SIZE])
+        for start in range(max(len(tokens) - SHINGLE_SIZE + 1, 0))
+    }
+
+
+def signature(text):
+    items = shingles(text)
+    if len(items) < settings.DUPLICATE_MIN_SHINGLES:
+        return None
+    hashes = np.array(
+        [zlib.crc32(item.encode()) for item in items], dtype=np.uint64)
+    hashes %= PRIME
+    multipliers, offsets = PERMUTATIONS
+    permuted = (np.outer(hashes, multipliers) + offsets) % PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_hashes(minhash):
+    rows = settings.MINHASH_PERMUTATIONS // settings.MINHASH_BANDS
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                minhash[band * rows:(band + 1) * rows].tobytes(),
+                digest_size=8
+            ).digest(),
+            'big', signed=True)
+        for band in range(settings.MINHASH_BANDS)
+    ]
+
+
+def similarity(first, second):
+    return float(np.mean(first == second))
+
+
+def find_duplicate(text, exclude=None):
+    minhash = signature(text)
+    if minhash is None:
+        return None
+    lookup = Q()
+    for band, bucket in enumerate(band_hashes(minhash)):
+        lookup |= Q(band=band, bucket=bucket)
+    candidates = LshBucket.objects.filter(lookup).values_list(
+        'post_id', flat=True).distinct()
+    if exclude is not None:
+        candidates = candidates.exclude(post_id=exclude)
+    signatures = PostSignature.objects.filter(post_id__in=candidates)
+    for post_id, stored in signatures.values_list('post_id', 'minhash'):
+        stored = np.frombuffer(stored, dtype=np.uint32)
+        if similarity(minhash, stored) >= settings.DUPLICATE_THRESHOLD:
+            return post_id
+    return None
+
+
+def index_posts(posts):
+    signatures, buckets = [], []
+    for post_id, text in posts:
+        minhash = signature(text)
+        if minhash is None:
+            continue
+        signatures.append(
+            PostSignature(post_id=post_id, minhash=minhash.tobytes()))
+        buckets.extend(
+            LshBucket(post_id=post_id, band=band, bucket=bucket)
+            for band, bucket in enumerate(band_hashes(minhash)))
+    ids = [post_id for post_id, _ in posts]
+    with transaction.atomic():
+        PostSignature.objects.filter(post_id__in=ids).delete()
+        LshBucket.objects.filter(post_id__in=ids).delete()
+        PostSignature.objects.bulk_create(signatures)
+        LshBucket.objects.bulk_create(buckets)
+    return len(signatures)
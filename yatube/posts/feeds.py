@@ -0,0 +1,161 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import Http404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from .models import FeedStamp, Group, Post, User
+
+FEEDS_UPDATED_KEY = 'feeds:updated'
+FEED_FIELDS = (
+    'id', 'text', 'pub_date', 'author__username',
+    'author__first_name', 'author__last_name',
+)
+
+
+def feeds_updated():
+    # Отметка хранится в базе, а в локальном кэше живёт недолго, чтобы
+    # изменения из других процессов доходили до лент за FEED_STAMP_TIMEOUT.
+    updated = cache.get(FEEDS_UPDATED_KEY)
+    if updated is None:
+        stamp, _ = FeedStamp.objects.get_or_create(
+            pk=1, defaults={'updated': timezone.now()})
+        updated = stamp.updated.timestamp()
+        cache.set(FEEDS_UPDATED_KEY, updated, settings.FEED_STAMP_TIMEOUT)
+    return updated
+
+
+def touch_feeds():
+    now = timezone.now()
+    if not FeedStamp.objects.filter(pk=1).update(updated=now):
+        FeedStamp.objects.get_or_create(pk=1, defaults={'updated': now})
+    cache.set(
+        FEEDS_UPDATED_KEY, now.timestamp(), settings.FEED_STAMP_TIMEOUT)
+
+
+def feed_etag(request, *args, **kwargs):
+    return f'{request.path}:{feeds_updated()}'
+
+
+def feed_last_modified(request, *args, **kwargs):
+    return datetime.fromtimestamp(feeds_updated(), timezone.utc)
+
+
+def cached_feed(feed):
+    @condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+    def cached_view(request, *args, **kwargs):
+        key = f'feed:{feed_etag(request)}'
+        response = cache.get(key)
+        if response is None:
+            response = feed(request, *args, **kwargs)
+            cache.set(key, response, settings.FEED_CACHE_TIMEOUT)
+        return response
+
+    def view(request, *args, **kwargs):
+        # Объект ищется до условной проверки, чтобы лента несуществующей
+        # группы или автора не получила 304 вместо 404.
+        feed.get_object(request, *args, **kwargs)
+        return cached_view(request, *args, **kwargs)
+    return view
+
+
+class LatestPostsFeed(Feed):
+    title = 'Yatube: последние обновления'
+    description = 'Последние записи на сайте'
+
+    def link(self):
+        return reverse('posts:index')
+
+    def get_posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        return self.get_posts(obj).values(
+            *FEED_FIELDS)[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return Truncator(item['text']).chars(50)
+
+    def item_description(self, item):
+        return item['text']
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=[item['id']])
+
+    def item_pubdate(self, item):
+        return item['pub_date']
+
+    def item_author_name(self, item):
+        full_name = (
+            f"{item['author__first_name']} {item['author__last_name']}")
+        return full_name.strip() or item['author__username']
+
+    def item_author_link(self, item):
+        return reverse('posts:profile', args=[item['author__username']])
+
+
+class GroupPostsFeed(LatestPostsFeed):
+    def get_object(self, request, slug):
+        group = Group.objects.filter(slug=slug).values(
+            'id', 'title', 'slug', 'description').first()
+        if group is None:
+            raise Http404('Группа не найдена')
+        return group
+
+    def title(self, obj):
+        return f"Yatube: записи сообщества {obj['title']}"
+
+    def description(self, obj):
+        return obj['description']
+
+    def link(self, obj):
+        return reverse('posts:group_list', args=[obj['slug']])
+
+    def get_posts(self, obj):
+        return Post.objects.filter(group_id=obj['id'])
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        author = User.objects.filter(username=username).values(
+            'id', 'username').first()
+        if author is None:
+            raise Http404('Пользователь не найден')
+        return author
+
+    def title(self, obj):
+        return f"Yatube: записи пользователя {obj['username']}"
+
+    def description(self, obj):
+        return f"Все записи пользователя {obj['username']}"
+
+    def link(self, obj):
+        return reverse('posts:profile', args=[obj['username']])
+
+    def get_posts(self, obj):
+        return Post.objects.filter(author_id=obj['id'])
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class GroupPostsAtomFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
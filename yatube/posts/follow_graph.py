@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+
+from .models import Follow, User
+
+
+class CSR:
+    def __init__(self, sources, targets):
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        size = int(sources.max()) + 1 if sources.size else 0
+        order = np.argsort(sources, kind='stable')
+        self.indices = targets[order]
+        self.indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=self.indptr[1:])
+
+    def edges(self, nodes, cap=None):
+        nodes = np.asarray(nodes, dtype=np.int64)
+        nodes = nodes[(nodes >= 0) & (nodes < len(self.indptr) - 1)]
+        starts = self.indptr[nodes]
+        lengths = self.indptr[nodes + 1] - starts
+        if cap is not None:
+            lengths = np.minimum(lengths, cap)
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(int(lengths.sum()))
+        return np.repeat(nodes, lengths), self.indices[positions]
+
+
+class FollowGraph:
+    def __init__(self):
+        # lock защищает данные графа, build_lock — от параллельных сборок.
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.following = self.followers = None
+        self.journal = None
+        self.built_at = 0
+
+    @classmethod
+    def from_edges(cls, edges):
+        graph = cls()
+        graph.load(edges)
+        return graph
+
+    def load(self, edges):
+        pairs = np.array(list(edges), dtype=np.int64).reshape(-1, 2)
+        following = CSR(pairs[:, 0], pairs[:, 1])
+        followers = CSR(pairs[:, 1], pairs[:, 0])
+        with self.lock:
+            self.following, self.followers = following, followers
+            self.added = defaultdict(set)
+            self.added_followers = defaultdict(set)
+            self.removed = set()
+            self.removed_keys = None
+            self.delta = 0
+            self.built_at = time.monotonic()
+            # Подписки, изменённые во время выборки из базы, могли в неё
+            # не попасть, поэтому накладываются на новый граф повторно.
+            journal, self.journal = self.journal or [], None
+            for apply, user, author in journal:
+                apply(user, author)
+
+    def build(self):
+        with self.lock:
+            self.journal = []
+        edges = Follow.objects.filter(
+            user__isnull=False, author__isnull=False
+        ).values_list('user_id', 'author_id').iterator()
+        self.load(edges)
+
+    def is_stale(self):
+        return (
+            self.following is None
+            or time.monotonic() - self.built_at > settings.FOLLOW_GRAPH_TTL
+            or self.delta > settings.FOLLOW_GRAPH_MAX_DELTA
+        )
+
+    def ensure_built(self):
+        with self.build_lock:
+            if self.is_stale():
+                self.build()
+
+    def has_edge(self, user, author):
+        csr = self.following
+        if not 0 <= user < len(csr.indptr) - 1:
+            return False
+        return author in csr.indices[csr.indptr[user]:csr.indptr[user + 1]]
+
+    def apply_add(self, user, author):
+        self.delta += 1
+        self.removed.discard((user, author))
+        self.removed_keys = None
+        if not self.has_edge(user, author):
+            self.added[user].add(author)
+            self.added_followers[author].add(user)
+
+    def apply_remove(self, user, author):
+        self.delta += 1
+        self.added[user].discard(author)
+        self.added_followers[author].discard(user)
+        self.removed.add((user, author))
+        self.removed_keys = None
+
+    def change(self, apply, user, author):
+        with self.lock:
+            if self.journal is not None:
+                self.journal.append((apply, user, author))
+            if self.following is not None:
+                apply(user, author)
+
+    def add(self, user, author):
+        self.change(self.apply_add, user, author)
+
+    def remove(self, user, author):
+        self.change(self.apply_remove, user, author)
+
+    def neighbors(self, nodes, followers=False, cap=None):
+        csr, added = self.following, self.added
+        if followers:
+            csr, added = self.followers, self.added_followers
+        sources, targets = csr.edges(nodes, cap)
+        if self.removed:
+            # Отписки накладываются маской по ключам (подписчик, автор).
+            users, authors = (targets, sources) if followers else (
+                sources, targets)
+            if self.removed_keys is None:
+                removed = np.array(list(self.removed), dtype=np.int64)
+                self.removed_keys = removed[:, 0] << 32 | removed[:, 1]
+            keep = ~np.isin(users << 32 | authors, self.removed_keys)
+            targets = targets[keep]
+        extra = [target for node in set(np.asarray(nodes).tolist())
+                 for target in added.get(node, ())]
+        if extra:
+            targets = np.concatenate(
+                [targets, np.array(extra, dtype=np.int64)])
+        return targets
+
+    def authors_of(self, user):
+        with self.lock:
+            return set(self.neighbors([user]).tolist())
+
+    def followers_of(self, author):
+        with self.lock:
+            return set(self.neighbors([author], followers=True).tolist())
+
+    def recommend(self, user, limit=None):
+        limit = limit or settings.FOLLOW_RECOMMENDATIONS
+        with self.lock:
+            return self.rank(user, limit)
+
+    def rank(self, user, limit):
+        followed = np.unique(self.neighbors([user]))
+        neighbours = self.neighbors(
+            followed, followers=True, cap=settings.FOLLOW_GRAPH_SAMPLE)
+        candidates = np.concatenate([
+            self.neighbors(followed),
+            self.neighbors(neighbours[neighbours != user]),
+        ])
+        if not candidates.size:
+            return []
+        scores = np.bincount(candidates)
+        excluded = np.append(followed, user)
+        scores[excluded[excluded < scores.size]] = 0
+        # Сортируются только набравшие очки авторы, а не весь bincount.
+        ranked = np.flatnonzero(scores)
+        order = np.argsort(-scores[ranked], kind='stable')[:limit]
+        return ranked[order].tolist()
+
+
+follow_graph = FollowGraph()
+
+
+def recommend_authors(user):
+    if not user.is_authenticated:
+        return []
+    follow_graph.ensure_built()
+    ids = follow_graph.recommend(user.pk)
+    authors = User.objects.in_bulk(ids)
+    return [authors[pk] for pk in ids if pk in authors]
@@ -0,0 +1,39 @@
+from django.db import IntegrityError, transaction
+
+from . import trending
+from .follow_graph import follow_graph
+from .leaderboards import bump_many
+from .models import Follow, LeaderboardScore, User
+from .unread import reset_unread
+
+
+def follows_created(user_id, author_ids):
+    if not author_ids:
+        return
+    reset_unread(user_id)
+    for author_id in author_ids:
+        follow_graph.add(user_id, author_id)
+    bump_many(LeaderboardScore.AUTHOR_FOLLOWERS, author_ids, 1)
+    trending.authors_followed(author_ids)
+
+
+def follow_authors(user, usernames):
+    authors = set(User.objects.filter(username__in=usernames).exclude(
+        pk=user.pk).values_list('id', flat=True))
+    for attempt in range(2):
+        authors -= set(Follow.objects.filter(
+            user=user, author_id__in=authors
+        ).values_list('author_id', flat=True))
+        # Без ignore_conflicts вставка либо проходит целиком, либо при
+        # гонке повторяется для оставшихся авторов, поэтому в учёт
+        # попадают только действительно созданные подписки.
+        try:
+            with transaction.atomic():
+                Follow.objects.bulk_create(
+                    Follow(user=user, author_id=author) for author in authors)
+            break
+        except IntegrityError:
+            if attempt:
+                raise
+    follows_created(user.pk, authors)
+    return authors
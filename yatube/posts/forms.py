@@ -1,5 +1,9 @@
+import re
+
 from django import forms
+from django.conf import settings
 
+from .duplicates import find_duplicate
 from .models import Comment, Post
 
 
@@ -12,6 +16,9 @@ class PostForm(forms.ModelForm):
         data = self.cleaned_data['text']
         if not data:
             raise forms.ValidationError('Внесите текст вашего поста')
+        if find_duplicate(data, exclude=self.instance.pk):
+            raise forms.ValidationError(
+                'Почти такой же пост уже опубликован')
         return data
 
 
@@ -19,3 +26,20 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ('text',)
+
+
+class FollowImportForm(forms.Form):
+    usernames = forms.CharField(
+        label='Авторы',
+        help_text='Имена пользователей через пробел, запятую или перенос',
+        widget=forms.Textarea,
+    )
+
+    def clean_usernames(self):
+        names = re.split(r'[\s,]+', self.cleaned_data['usernames'])
+        usernames = list(dict.fromkeys(name for name in names if name))
+        if len(usernames) > settings.FOLLOW_IMPORT_LIMIT:
+            raise forms.ValidationError(
+                f'За один раз можно подписаться не более чем на '
+                f'{settings.FOLLOW_IMPORT_LIMIT} авторов')
+        return usernames
@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, Subquery
+from django.http import Http404
+
+from .models import Group, GroupAuthorStats, GroupStats, Post
+
+
+def group_key(slug):
+    return f'group:slug:{slug}'
+
+
+def get_group(slug):
+    group = cache.get(group_key(slug))
+    if group is None:
+        group = Group.objects.filter(slug=slug).first()
+        if group is None:
+            raise Http404('Группа не найдена')
+        cache.set(group_key(slug), group, settings.GROUP_CACHE_TIMEOUT)
+    return group
+
+
+def forget_group(*slugs):
+    cache.delete_many([group_key(slug) for slug in slugs if slug])
+
+
+def change_author_posts(group_id, author_id, delta):
+    rows = GroupAuthorStats.objects.filter(
+        group_id=group_id, author_id=author_id)
+    if delta > 0:
+        if rows.update(post_count=F('post_count') + delta):
+            return 0
+        rows.create(group_id=group_id, author_id=author_id, post_count=delta)
+        return 1
+    rows.update(post_count=F('post_count') + delta)
+    deleted, _ = rows.filter(post_count__lte=0).delete()
+    return -1 if deleted else 0
+
+
+@transaction.atomic
+def post_added(group_id, author_id, pub_date):
+    GroupStats.objects.get_or_create(group_id=group_id)
+    authors = change_author_posts(group_id, author_id, 1)
+    GroupStats.objects.filter(group_id=group_id).update(
+        post_count=F('post_count') + 1,
+        author_count=F('author_count') + authors)
+    GroupStats.objects.filter(group_id=group_id).exclude(
+        last_post_at__gte=pub_date).update(last_post_at=pub_date)
+
+
+@transaction.atomic
+def post_removed(group_id, author_id, pub_date):
+    authors = change_author_posts(group_id, author_id, -1)
+    GroupStats.objects.filter(group_id=group_id).update(
+        post_count=F('post_count') - 1,
+        author_count=F('author_count') + authors)
+    latest = Post.objects.filter(group_id=group_id).order_by(
+        '-pub_date').values('pub_date')[:1]
+    GroupStats.objects.filter(
+        group_id=group_id, last_post_at__lte=pub_date
+    ).update(last_post_at=Subquery(latest))
+
+
+def rebuild():
+    stats = {
+        group_id: GroupStats(group_id=group_id)
+        for group_id in Group.objects.values_list('id', flat=True)
+    }
+    authors = []
+    rows = Post.objects.exclude(group=None).values_list(
+        'group', 'author').annotate(
+            posts=Count('id'), last=Max('pub_date')).order_by()
+    for group_id, author_id, posts, last in rows.iterator():
+        group = stats[group_id]
+        group.post_count += posts
+        group.author_count += 1
+        group.last_post_at = max(group.last_post_at or last, last)
+        authors.append(GroupAuthorStats(
+            group_id=group_id, author_id=author_id, post_count=posts))
+    with transaction.atomic():
+        GroupStats.objects.all().delete()
+        GroupAuthorStats.objects.all().delete()
+        GroupStats.objects.bulk_create(stats.values())
+        GroupAuthorStats.objects.bulk_create(authors)
+    return len(stats)
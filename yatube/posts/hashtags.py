@@ -0,0 +1,27 @@
+import re
+
+from django.db import transaction
+
+from .models import PostTag
+
+HASHTAG_RE = re.compile(r'#(\w{1,100})')
+
+
+def extract_tags(text):
+    return {tag.lower() for tag in HASHTAG_RE.findall(text)}
+
+
+def tag_rows(posts):
+    return [
+        PostTag(post_id=pk, tag=tag, pub_date=pub_date)
+        for pk, text, pub_date in posts
+        for tag in extract_tags(text)
+    ]
+
+
+def index_tags(posts):
+    rows = tag_rows(posts)
+    with transaction.atomic():
+        PostTag.objects.filter(post_id__in=[pk for pk, _, _ in posts]).delete()
+        PostTag.objects.bulk_create(rows)
+    return len(rows)
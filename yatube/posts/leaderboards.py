@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Group, LeaderboardScore, User
+
+WINDOWS = ('day', 'week', 'all')
+
+
+def bucket_for(window, moment=None):
+    if window == 'all':
+        return 'all'
+    day = timezone.localdate(moment or timezone.now())
+    if window == 'day':
+        return f'day:{day.isoformat()}'
+    year, week, _ = day.isocalendar()
+    return f'week:{year}-W{week:02d}'
+
+
+def prune_buckets(moment=None):
+    # Дневные и недельные корзины нужны только для текущих окон.
+    moment = moment or timezone.now()
+    oldest_day = moment - timedelta(days=settings.LEADERBOARD_KEEP_DAYS)
+    oldest_week = moment - timedelta(weeks=settings.LEADERBOARD_KEEP_WEEKS)
+    stale = LeaderboardScore.objects.filter(
+        bucket__startswith='day:',
+        bucket__lt=bucket_for('day', oldest_day),
+    ) | LeaderboardScore.objects.filter(
+        bucket__startswith='week:',
+        bucket__lt=bucket_for('week', oldest_week),
+    )
+    return stale.delete()[0]
+
+
+def add_score(board, bucket, object_id, delta):
+    scores = LeaderboardScore.objects.filter(
+        board=board, bucket=bucket, object_id=object_id)
+    if scores.update(score=F('score') + delta):
+        return
+    try:
+        with transaction.atomic():
+            scores.create(
+                board=board, bucket=bucket, object_id=object_id, score=delta)
+    except IntegrityError:
+        scores.update(score=F('score') + delta)
+
+
+def prune_daily():
+    if cache.add(f'leaderboards:pruned:{bucket_for("day")}', True,
+                 24 * 60 * 60):
+        prune_buckets()
+
+
+def bump(board, object_id, delta, moment=None):
+    prune_daily()
+    for window in WINDOWS:
+        add_score(board, bucket_for(window, moment), object_id, delta)
+
+
+def bump_many(board, object_ids, delta, moment=None):
+    prune_daily()
+    for window in WINDOWS:
+        bucket = bucket_for(window, moment)
+        scores = LeaderboardScore.objects.filter(
+            board=board, bucket=bucket, object_id__in=object_ids)
+        existing = set(scores.values_list('object_id', flat=True))
+        scores.filter(object_id__in=existing).update(
+            score=F('score') + delta)
+        missing = set(object_ids) - existing
+        try:
+            with transaction.atomic():
+                LeaderboardScore.objects.bulk_create(
+                    LeaderboardScore(
+                        board=board, bucket=bucket, object_id=object_id,
+                        score=delta)
+                    for object_id in missing)
+        except IntegrityError:
+            for object_id in missing:
+                add_score(board, bucket, object_id, delta)
+
+
+def top(board, window, limit=None):
+    limit = limit or settings.LEADERBOARD_SIZE
+    rows = list(LeaderboardScore.objects.filter(
+        board=board, bucket=bucket_for(window), score__gt=0
+    ).order_by('-score').values_list('object_id', 'score')[:limit])
+    model = Group if board == LeaderboardScore.GROUP_POSTS else User
+    objects = model.objects.in_bulk([object_id for object_id, _ in rows])
+    return [
+        (objects[object_id], score)
+        for object_id, score in rows if object_id in objects
+    ]
@@ -0,0 +1,36 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.follow_graph import FollowGraph
+
+
+class Command(BaseCommand):
+    help = 'Замеряет построение графа подписок и выдачу рекомендаций'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--edges', type=int, default=1_000_000)
+        parser.add_argument('--users', type=int, default=100_000)
+        parser.add_argument('--queries', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        users = options['users']
+        edges = {
+            (rng.randrange(1, users), rng.randrange(1, users))
+            for _ in range(options['edges'])
+        }
+        started = time.perf_counter()
+        graph = FollowGraph.from_edges(edges)
+        build_time = time.perf_counter() - started
+        self.stdout.write(
+            f'Граф: {len(edges)} рёбер, построение {build_time:.2f} с')
+        started = time.perf_counter()
+        for _ in range(options['queries']):
+            graph.recommend(rng.randrange(1, users), limit=10)
+        query_time = time.perf_counter() - started
+        self.stdout.write(
+            f"Рекомендации: {options['queries']} запросов, "
+            f"{query_time / options['queries'] * 1000:.2f} мс на запрос")
@@ -0,0 +1,61 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.models import Post, TrendingScore
+from posts.trending import add_engagement, decay, trending_posts
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Замеряет операции над таблицей популярности; '
+            'данные создаются в транзакции и откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1_000_000)
+        parser.add_argument('--events', type=int, default=10_000)
+        parser.add_argument('--batch', type=int, default=10_000)
+
+    def timed(self, label, func, count=1):
+        started = time.perf_counter()
+        for _ in range(count):
+            func()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{label}: {elapsed:.3f} с ({elapsed / count * 1000:.3f} мс)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        author = User.objects.create(username='trending-benchmark')
+        total, batch = options['posts'], options['batch']
+        started = time.perf_counter()
+        for offset in range(0, total, batch):
+            Post.objects.bulk_create(
+                Post(author=author, text='benchmark')
+                for _ in range(min(batch, total - offset)))
+        TrendingScore.objects.bulk_create(
+            TrendingScore(post_id=pk, score=random.random())
+            for pk in author.posts.values_list('pk', flat=True).iterator()
+        )
+        self.stdout.write(
+            f'Заполнение {total} постов: '
+            f'{time.perf_counter() - started:.1f} с')
+        last_id = Post.objects.order_by('-pk').values_list(
+            'pk', flat=True).first()
+        self.timed(
+            'Событие комментария',
+            lambda: add_engagement(
+                'comment', [random.randint(1, last_id)]),
+            options['events'])
+        self.timed(
+            'Первая страница популярного',
+            lambda: list(trending_posts()[:10]), 100)
+        self.timed('Затухание', lambda: decay(1))
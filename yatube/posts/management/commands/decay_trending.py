@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import decay
+
+
+class Command(BaseCommand):
+    help = 'Затухание популярности постов, запускается по расписанию'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=float, default=1,
+            help='Сколько часов прошло с предыдущего запуска')
+
+    def handle(self, *args, **options):
+        deleted = decay(options['hours'])
+        self.stdout.write(f'Удалено угасших записей: {deleted}')
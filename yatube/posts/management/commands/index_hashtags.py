@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from posts.hashtags import index_tags
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Заполняет таблицу хештегов по уже опубликованным постам'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=500)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('id').values_list(
+            'id', 'text', 'pub_date').iterator()
+        batch, total = [], 0
+        for post in posts:
+            batch.append(post)
+            if len(batch) == options['batch']:
+                total += index_tags(batch)
+                batch = []
+        if batch:
+            total += index_tags(batch)
+        self.stdout.write(f'Записано хештегов: {total}')
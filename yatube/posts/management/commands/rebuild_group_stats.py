@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from posts.group_stats import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает статистику сообществ по текущим постам'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Пересчитано сообществ: {rebuild()}')
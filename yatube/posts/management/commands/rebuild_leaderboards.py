@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from posts.leaderboards import WINDOWS, bucket_for, prune_buckets
+from posts.models import Follow, LeaderboardScore, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинги авторов и групп по текущим данным'
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        today = timezone.localdate(now)
+        since = {
+            'day': today,
+            'week': today - timedelta(days=today.weekday()),
+            'all': None,
+        }
+        scores = []
+        recomputed = Q(pk__in=[])
+        for window in WINDOWS:
+            posts = Post.objects.all()
+            if since[window]:
+                posts = posts.filter(pub_date__date__gte=since[window])
+            counts = {
+                LeaderboardScore.AUTHOR_POSTS:
+                    posts.values_list('author').annotate(Count('id')),
+                LeaderboardScore.GROUP_POSTS:
+                    posts.exclude(group=None).values_list(
+                        'group').annotate(Count('id')),
+            }
+            if window == 'all':
+                counts[LeaderboardScore.AUTHOR_FOLLOWERS] = (
+                    Follow.objects.exclude(author=None).values_list(
+                        'author').annotate(Count('id')))
+            for board, rows in counts.items():
+                recomputed |= Q(board=board, bucket=bucket_for(window, now))
+                scores.extend(
+                    LeaderboardScore(
+                        board=board, bucket=bucket_for(window, now),
+                        object_id=object_id, score=score)
+                    for object_id, score in rows.order_by()
+                )
+        with transaction.atomic():
+            # Подписчики за день и неделю не восстановить по текущим
+            # данным, поэтому удаляются только пересчитанные корзины.
+            LeaderboardScore.objects.filter(recomputed).delete()
+            LeaderboardScore.objects.bulk_create(scores, batch_size=1000)
+        pruned = prune_buckets(now)
+        self.stdout.write(
+            f'Записано строк рейтинга: {len(scores)}, '
+            f'удалено устаревших: {pruned}')
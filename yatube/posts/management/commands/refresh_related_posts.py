@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts.related import refresh_related
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает похожие записи для новых и изменённых постов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Перестроить индекс по всем постам')
+
+    def handle(self, *args, **options):
+        count = refresh_related(full=options['full'])
+        self.stdout.write(f'Обновлено постов: {count}')
@@ -0,0 +1,53 @@
+from itertools import combinations
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from posts.duplicates import index_posts, similarity
+from posts.models import LshBucket, Post, PostSignature
+
+
+class Command(BaseCommand):
+    help = ('Строит MinHash-подписи для постов без них '
+            'и выводит пары почти одинаковых постов')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=500)
+
+    def backfill(self, batch_size):
+        posts = Post.objects.filter(signature__isnull=True).order_by(
+            'id').values_list('id', 'text').iterator()
+        batch, indexed = [], 0
+        for post in posts:
+            batch.append(post)
+            if len(batch) == batch_size:
+                indexed += index_posts(batch)
+                batch = []
+        if batch:
+            indexed += index_posts(batch)
+        return indexed
+
+    def handle(self, *args, **options):
+        indexed = self.backfill(options['batch'])
+        self.stdout.write(f'Проиндексировано постов: {indexed}')
+        crowded = LshBucket.objects.values('band', 'bucket').annotate(
+            total=Count('id')).filter(total__gt=1).order_by()
+        pairs = set()
+        for row in crowded.iterator():
+            ids = LshBucket.objects.filter(
+                band=row['band'], bucket=row['bucket']
+            ).values_list('post_id', flat=True)
+            pairs.update(combinations(sorted(ids), 2))
+        found = 0
+        for first, second in sorted(pairs):
+            signatures = dict(PostSignature.objects.filter(
+                post_id__in=(first, second)).values_list('post_id', 'minhash'))
+            score = similarity(
+                np.frombuffer(signatures[first], dtype=np.uint32),
+                np.frombuffer(signatures[second], dtype=np.uint32))
+            if score >= settings.DUPLICATE_THRESHOLD:
+                found += 1
+                self.stdout.write(f'{first} ~ {second}: {score:.2f}')
+        self.stdout.write(f'Найдено почти одинаковых пар: {found}')
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.16 on 2026-10-19 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_auto_20230129_1332'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardScore',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('author_posts', 'Авторы по числу постов'), ('author_followers', 'Авторы по приросту подписчиков'), ('group_posts', 'Группы по числу постов')], max_length=20, verbose_name='Рейтинг')),
+                ('bucket', models.CharField(max_length=20, verbose_name='Период')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Объект')),
+                ('score', models.IntegerField(default=0, verbose_name='Очки')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardscore',
+            index=models.Index(fields=['board', 'bucket', '-score'], name='posts_leade_board_2096c7_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='leaderboardscore',
+            unique_together={('board', 'bucket', 'object_id')},
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.16 on 2026-10-19 06:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0009_auto_20261019_0644'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedVisit',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seen_at', models.DateTimeField(verbose_name='Последний просмотр ленты подписок')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', 'pub_date'], name='posts_post_author__b65dbb_idx'),
+        ),
+        migrations.AddField(
+            model_name='feedvisit',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='feed_visit', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+    ]
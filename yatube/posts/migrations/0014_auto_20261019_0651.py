@@ -0,0 +1,79 @@
+# Generated by Django 2.2.16 on 2026-10-19 06:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+import django.db.models.deletion
+
+
+def build_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    GroupAuthorStats = apps.get_model('posts', 'GroupAuthorStats')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    Post = apps.get_model('posts', 'Post')
+    stats = {
+        group_id: GroupStats(group_id=group_id)
+        for group_id in Group.objects.values_list('id', flat=True)
+    }
+    authors = []
+    rows = Post.objects.exclude(group=None).values_list(
+        'group', 'author').annotate(
+            posts=Count('id'), last=Max('pub_date')).order_by()
+    for group_id, author_id, posts, last in rows.iterator():
+        group = stats[group_id]
+        group.post_count += posts
+        group.author_count += 1
+        group.last_post_at = max(group.last_post_at or last, last)
+        authors.append(GroupAuthorStats(
+            group_id=group_id, author_id=author_id, post_count=posts))
+    GroupStats.objects.bulk_create(stats.values())
+    GroupAuthorStats.objects.bulk_create(authors)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0013_auto_20261019_0650'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupAuthorStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_count', models.IntegerField(default=0, verbose_name='Число постов')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group', verbose_name='Группа')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Число постов')),
+                ('author_count', models.PositiveIntegerField(default=0, verbose_name='Число авторов')),
+                ('last_post_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата последнего поста')),
+            ],
+            options={
+                'ordering': ('-post_count', 'group_id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='groupstats',
+            index=models.Index(fields=['-post_count', 'group'], name='posts_group_post_co_dfdaf2_idx'),
+        ),
+        migrations.AddField(
+            model_name='groupauthorstats',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_stats', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+        ),
+        migrations.AddField(
+            model_name='groupauthorstats',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='author_stats', to='posts.Group', verbose_name='Группа'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='groupauthorstats',
+            unique_together={('group', 'author')},
+        ),
+        migrations.RunPython(build_group_stats, migrations.RunPython.noop),
+    ]
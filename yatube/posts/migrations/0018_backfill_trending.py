@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+from django.utils import timezone
+
+
+def backfill_trending(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    TrendingScore = apps.get_model('posts', 'TrendingScore')
+    weights = settings.TRENDING_WEIGHTS
+    now = timezone.now()
+    posts = Post.objects.filter(
+        pub_date__gte=now - timedelta(days=settings.TRENDING_WINDOW_DAYS),
+        trending__isnull=True,
+    ).annotate(comment_count=Count('comments')).values_list(
+        'id', 'pub_date', 'comment_count')
+    scores = []
+    for post_id, pub_date, comment_count in posts.iterator():
+        # Очки сразу затухают по возрасту поста, как при регулярном decay.
+        hours = (now - pub_date).total_seconds() / 3600
+        score = (weights['post'] + weights['comment'] * comment_count) * (
+            0.5 ** (hours / settings.TRENDING_HALF_LIFE_HOURS))
+        if score >= settings.TRENDING_MIN_SCORE:
+            scores.append(TrendingScore(post_id=post_id, score=score))
+    TrendingScore.objects.bulk_create(scores, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_comment_follow_verbose_names'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_trending, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_backfill_trending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedStamp',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated', models.DateTimeField(verbose_name='Последнее изменение постов')),
+            ],
+        ),
+    ]
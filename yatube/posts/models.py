@@ -45,6 +45,29 @@ class Post(models.Model):
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(fields=('author', 'pub_date')),
+        )
+
+
+class PostTag(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='tags',
+        verbose_name='Пост'
+    )
+    tag = models.CharField('Хештег', max_length=100)
+    pub_date = models.DateTimeField('Дата публикации поста')
+
+    class Meta:
+        unique_together = ('post', 'tag')
+        indexes = (
+            models.Index(fields=('tag', '-pub_date')),
+        )
+
+    def __str__(self) -> str:
+        return self.tag
 
 
 class Comment(models.Model):
@@ -81,3 +104,149 @@ class Follow(models.Model):
         related_name='following',
         verbose_name='Автор, на которого подписываются'
     )
+
+    class Meta:
+        unique_together = ('user', 'author')
+
+
+class FeedVisit(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_visit',
+        verbose_name='Пользователь'
+    )
+    seen_at = models.DateTimeField('Последний просмотр ленты подписок')
+
+
+class TrendingScore(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='Пост'
+    )
+    score = models.FloatField('Популярность', default=0, db_index=True)
+
+
+class RelatedPost(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='related_links',
+        verbose_name='Пост'
+    )
+    related = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Похожий пост'
+    )
+    score = models.FloatField('Сходство')
+
+    class Meta:
+        ordering = ('-score',)
+        unique_together = ('post', 'related')
+
+
+class RelatedRefresh(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        verbose_name='Пост для пересчёта похожих'
+    )
+
+
+class PostSignature(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='signature',
+        verbose_name='Пост'
+    )
+    minhash = models.BinaryField('MinHash-подпись')
+
+
+class LshBucket(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='lsh_buckets',
+        verbose_name='Пост'
+    )
+    band = models.PositiveSmallIntegerField('Полоса')
+    bucket = models.BigIntegerField('Корзина')
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('band', 'bucket')),
+        )
+
+
+class GroupStats(models.Model):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Группа'
+    )
+    post_count = models.PositiveIntegerField('Число постов', default=0)
+    author_count = models.PositiveIntegerField('Число авторов', default=0)
+    last_post_at = models.DateTimeField(
+        'Дата последнего поста', blank=True, null=True)
+
+    class Meta:
+        ordering = ('-post_count', 'group_id')
+        indexes = (
+            models.Index(fields=('-post_count', 'group')),
+        )
+
+
+class GroupAuthorStats(models.Model):
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='author_stats',
+        verbose_name='Группа'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='group_stats',
+        verbose_name='Автор'
+    )
+    post_count = models.IntegerField('Число постов', default=0)
+
+    class Meta:
+        unique_together = ('group', 'author')
+
+
+class LeaderboardScore(models.Model):
+    AUTHOR_POSTS = 'author_posts'
+    AUTHOR_FOLLOWERS = 'author_followers'
+    GROUP_POSTS = 'group_posts'
+    BOARDS = (
+        (AUTHOR_POSTS, 'Авторы по числу постов'),
+        (AUTHOR_FOLLOWERS, 'Авторы по приросту подписчиков'),
+        (GROUP_POSTS, 'Группы по числу постов'),
+    )
+
+    board = models.CharField('Рейтинг', max_length=20, choices=BOARDS)
+    bucket = models.CharField('Период', max_length=20)
+    object_id = models.PositiveIntegerField('Объект')
+    score = models.IntegerField('Очки', default=0)
+
+    class Meta:
+        unique_together = ('board', 'bucket', 'object_id')
+        indexes = (
+            models.Index(fields=('board', 'bucket', '-score')),
+        )
+
+
+class FeedStamp(models.Model):
+    updated = models.DateTimeField('Последнее изменение постов')
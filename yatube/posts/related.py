@@ -0,0 +1,198 @@
+import os
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .models import Post, RelatedPost, RelatedRefresh
+
+TOKEN_RE = re.compile(r'\w{2,}')
+
+
+def count_tokens(texts):
+    # Разреженные строки: indptr, индексы хешей слов и их количества.
+    indptr, indices, counts = [0], [], []
+    for text in texts:
+        tokens = Counter(
+            zlib.crc32(token.encode()) % settings.RELATED_DIM
+            for token in TOKEN_RE.findall(text.lower()))
+        indices.extend(sorted(tokens))
+        counts.extend(tokens[index] for index in sorted(tokens))
+        indptr.append(len(indices))
+    return (
+        np.array(indptr, dtype=np.int64),
+        np.array(indices, dtype=np.int64),
+        np.array(counts, dtype=np.float32),
+    )
+
+
+def row_numbers(indptr):
+    return np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+
+def embed(indptr, indices, counts, idf):
+    data = np.log1p(counts) * idf[indices]
+    rows = row_numbers(indptr)
+    norms = np.sqrt(np.bincount(
+        rows, weights=data ** 2, minlength=len(indptr) - 1))
+    return (data / norms[rows]).astype(np.float32)
+
+
+class RelatedIndex:
+    def __init__(self, ids, indptr, indices, data, idf):
+        self.ids = ids
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.idf = idf
+
+    @classmethod
+    def build(cls):
+        ids, texts = [], []
+        for pk, text in Post.objects.order_by('id').values_list(
+                'id', 'text').iterator():
+            ids.append(pk)
+            texts.append(text)
+        indptr, indices, counts = count_tokens(texts)
+        document_frequency = np.bincount(
+            indices, minlength=settings.RELATED_DIM)
+        idf = np.log((1 + len(ids)) / (1 + document_frequency)) + 1
+        idf = idf.astype(np.float32)
+        return cls(
+            np.array(ids, dtype=np.int64), indptr, indices,
+            embed(indptr, indices, counts, idf), idf)
+
+    @classmethod
+    def load(cls):
+        if not os.path.exists(settings.RELATED_INDEX_PATH):
+            return None
+        with np.load(settings.RELATED_INDEX_PATH) as data:
+            # Индекс старого формата или другой размерности строится заново.
+            if 'indptr' not in data or len(
+                    data['idf']) != settings.RELATED_DIM:
+                return None
+            return cls(data['ids'], data['indptr'], data['indices'],
+                       data['data'], data['idf'])
+
+    def save(self):
+        os.makedirs(
+            os.path.dirname(settings.RELATED_INDEX_PATH), exist_ok=True)
+        with open(settings.RELATED_INDEX_PATH, 'wb') as index_file:
+            np.savez(
+                index_file, ids=self.ids, indptr=self.indptr,
+                indices=self.indices, data=self.data, idf=self.idf)
+
+    def keep_rows(self, keep):
+        lengths = np.diff(self.indptr)
+        entries = np.repeat(keep, lengths)
+        self.ids = self.ids[keep]
+        self.indices = self.indices[entries]
+        self.data = self.data[entries]
+        self.indptr = np.concatenate([[0], np.cumsum(lengths[keep])])
+
+    def prune(self):
+        self.keep_rows(np.isin(
+            self.ids, list(Post.objects.values_list('id', flat=True))))
+
+    def update(self, posts):
+        self.keep_rows(~np.isin(self.ids, [pk for pk, _ in posts]))
+        indptr, indices, counts = count_tokens([text for _, text in posts])
+        self.ids = np.concatenate(
+            [self.ids, np.array([pk for pk, _ in posts], np.int64)])
+        self.indptr = np.concatenate(
+            [self.indptr, self.indptr[-1] + indptr[1:]])
+        self.indices = np.concatenate([self.indices, indices])
+        self.data = np.concatenate(
+            [self.data, embed(indptr, indices, counts, self.idf)])
+
+    def postings(self):
+        order = np.argsort(self.indices, kind='stable')
+        starts = np.zeros(settings.RELATED_DIM + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=settings.RELATED_DIM),
+                  out=starts[1:])
+        return starts, row_numbers(self.indptr)[order], self.data[order]
+
+    def scores(self, row, postings):
+        # Скалярные произведения только с постами, у которых есть общие
+        # слова, через обратный индекс.
+        starts, documents, weights = postings
+        terms = self.indices[self.indptr[row]:self.indptr[row + 1]]
+        values = self.data[self.indptr[row]:self.indptr[row + 1]]
+        lengths = starts[terms + 1] - starts[terms]
+        positions = np.repeat(
+            starts[terms] - np.cumsum(lengths) + lengths, lengths
+        ) + np.arange(int(lengths.sum()))
+        candidates, inverse = np.unique(
+            documents[positions], return_inverse=True)
+        totals = np.bincount(
+            inverse, weights=weights[positions] * np.repeat(values, lengths))
+        mask = candidates != row
+        return candidates[mask], totals[mask]
+
+    def top_k(self, ids, k):
+        rows = np.flatnonzero(np.isin(self.ids, ids))
+        if not len(rows) or k <= 0:
+            return []
+        postings = self.postings()
+        links = []
+        for row in rows:
+            candidates, totals = self.scores(row, postings)
+            if len(candidates) > k:
+                best = np.argpartition(-totals, k - 1)[:k]
+                candidates, totals = candidates[best], totals[best]
+            links.extend(
+                (int(self.ids[row]), int(self.ids[column]), float(score))
+                for column, score in zip(candidates, totals) if score > 0)
+        return links
+
+
+def store_links(ids, links, k):
+    with transaction.atomic():
+        RelatedPost.objects.bulk_create(
+            [RelatedPost(post_id=post, related_id=related, score=score)
+             for post, related, score in links]
+            + [RelatedPost(post_id=related, related_id=post, score=score)
+               for post, related, score in links],
+            ignore_conflicts=True
+        )
+        for post in {related for _, related, _ in links} - set(ids):
+            extra = RelatedPost.objects.filter(post_id=post).values_list(
+                'id', flat=True)[k:]
+            RelatedPost.objects.filter(id__in=list(extra)).delete()
+
+
+def chunks(ids):
+    for start in range(0, len(ids), settings.RELATED_BATCH):
+        yield ids[start:start + settings.RELATED_BATCH]
+
+
+def refresh_related(full=False):
+    index = None if full else RelatedIndex.load()
+    if index is None:
+        index = RelatedIndex.build()
+        ids = [int(pk) for pk in index.ids]
+        RelatedPost.objects.all().delete()
+    else:
+        ids = list(RelatedRefresh.objects.values_list('post_id', flat=True))
+        index.prune()
+        for chunk in chunks(ids):
+            index.update(list(Post.objects.filter(
+                id__in=chunk).values_list('id', 'text')))
+            RelatedPost.objects.filter(post_id__in=chunk).delete()
+            RelatedPost.objects.filter(related_id__in=chunk).delete()
+    for chunk in chunks(ids):
+        store_links(chunk, index.top_k(chunk, settings.RELATED_POSTS),
+                    settings.RELATED_POSTS)
+        RelatedRefresh.objects.filter(post_id__in=chunk).delete()
+    index.save()
+    return len(ids)
+
+
+def related_posts(post):
+    return [
+        link.related for link in post.related_links.select_related(
+            'related__author')[:settings.RELATED_POSTS]
+    ]
@@ -0,0 +1,143 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import group_stats, trending
+from .duplicates import index_posts
+from .feeds import touch_feeds
+from .follow_graph import follow_graph
+from .follows import follows_created
+from .hashtags import index_tags
+from .leaderboards import bump
+from .models import (
+    Comment, Follow, Group, GroupStats, LeaderboardScore, Post,
+    RelatedRefresh, User,
+)
+from .sitemaps import invalidate_chunk
+from .unread import author_posts_changed, reset_unread
+from .usernames import forget_username
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    touch_feeds()
+    invalidate_chunk('posts', instance.pk)
+    invalidate_chunk('profiles', instance.author_id)
+    for group_id in {instance.group_id,
+                     getattr(instance, 'previous_group_id', None)}:
+        if group_id:
+            invalidate_chunk('groups', group_id)
+
+
+@receiver(pre_save, sender=Post)
+def post_group_before_save(sender, instance, **kwargs):
+    instance.previous_group_id = instance.previous_text = None
+    if instance.pk:
+        instance.previous_group_id, instance.previous_text = (
+            Post.objects.filter(pk=instance.pk).values_list(
+                'group_id', 'text').first() or (None, None))
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    if getattr(instance, 'previous_text', None) != instance.text:
+        RelatedRefresh.objects.get_or_create(post=instance)
+    index_posts([(instance.pk, instance.text)])
+    index_tags([(instance.pk, instance.text, instance.pub_date)])
+    previous = getattr(instance, 'previous_group_id', None)
+    if previous == instance.group_id:
+        return
+    if previous:
+        group_stats.post_removed(
+            previous, instance.author_id, instance.pub_date)
+        bump(LeaderboardScore.GROUP_POSTS, previous, -1, instance.pub_date)
+    if instance.group_id:
+        group_stats.post_added(
+            instance.group_id, instance.author_id, instance.pub_date)
+        bump(LeaderboardScore.GROUP_POSTS, instance.group_id, 1,
+             instance.pub_date)
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+    author_posts_changed(instance.author_id)
+    trending.post_published(instance)
+    bump(LeaderboardScore.AUTHOR_POSTS, instance.author_id, 1,
+         instance.pub_date)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    author_posts_changed(instance.author_id)
+    if instance.group_id:
+        group_stats.post_removed(
+            instance.group_id, instance.author_id, instance.pub_date)
+    bump(LeaderboardScore.AUTHOR_POSTS, instance.author_id, -1,
+         instance.pub_date)
+    if instance.group_id:
+        bump(LeaderboardScore.GROUP_POSTS, instance.group_id, -1,
+             instance.pub_date)
+
+
+@receiver(pre_save, sender=Group)
+def group_before_save(sender, instance, **kwargs):
+    instance.previous_slug = None
+    if instance.pk:
+        instance.previous_slug = Group.objects.filter(
+            pk=instance.pk).values_list('slug', flat=True).first()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):
+    invalidate_chunk('groups', instance.pk)
+    group_stats.forget_group(
+        instance.slug, getattr(instance, 'previous_slug', None))
+
+
+@receiver(post_save, sender=Group)
+def group_created(sender, instance, created, **kwargs):
+    if created:
+        GroupStats.objects.get_or_create(group=instance)
+
+
+@receiver(pre_save, sender=User)
+def user_before_save(sender, instance, update_fields=None, **kwargs):
+    instance.previous_username = None
+    if instance.pk and (update_fields is None or 'username' in update_fields):
+        instance.previous_username = User.objects.filter(
+            pk=instance.pk).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_chunk('profiles', instance.pk)
+    if instance.previous_username != instance.username:
+        forget_username(instance.previous_username)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    forget_username(instance.username)
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created and instance.user_id and instance.author_id:
+        follows_created(instance.user_id, [instance.author_id])
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    if instance.user_id and instance.author_id:
+        follow_graph.remove(instance.user_id, instance.author_id)
+        reset_unread(instance.user_id)
+        bump(LeaderboardScore.AUTHOR_FOLLOWERS, instance.author_id, -1)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        trending.comment_added(instance)
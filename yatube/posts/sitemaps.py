@@ -0,0 +1,143 @@
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import ExpressionWrapper, F, IntegerField, Max
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+
+from .models import Group, Post, User
+
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+INDEX_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+
+
+def post_entries(lo, hi):
+    posts = Post.objects.filter(id__gt=lo, id__lte=hi).order_by('id')
+    for pk, pub_date in posts.values_list('id', 'pub_date').iterator():
+        yield reverse('posts:post_detail', args=[pk]), pub_date
+
+
+def profile_entries(lo, hi):
+    authors = User.objects.filter(
+        id__gt=lo, id__lte=hi, posts__isnull=False
+    ).annotate(lastmod=Max('posts__pub_date')).order_by('id')
+    for username, lastmod in authors.values_list(
+            'username', 'lastmod').iterator():
+        yield reverse('posts:profile', args=[username]), lastmod
+
+
+def group_entries(lo, hi):
+    groups = Group.objects.filter(id__gt=lo, id__lte=hi).annotate(
+        lastmod=Max('posts__pub_date')).order_by('id')
+    for slug, lastmod in groups.values_list('slug', 'lastmod').iterator():
+        yield reverse('posts:group_list', args=[slug]), lastmod
+
+
+SECTIONS = {
+    'posts': post_entries,
+    'profiles': profile_entries,
+    'groups': group_entries,
+}
+
+
+def chunk_expression(field):
+    return ExpressionWrapper(
+        (F(field) - 1) / settings.SITEMAP_CHUNK_SIZE,
+        output_field=IntegerField())
+
+
+def section_chunks(section):
+    if section == 'posts':
+        rows = Post.objects.annotate(chunk=chunk_expression('id'))
+        lastmod = Max('pub_date')
+    elif section == 'profiles':
+        rows = Post.objects.annotate(chunk=chunk_expression('author_id'))
+        lastmod = Max('pub_date')
+    else:
+        rows = Group.objects.annotate(chunk=chunk_expression('id'))
+        lastmod = Max('posts__pub_date')
+    return list(rows.order_by().values('chunk').annotate(
+        lastmod=lastmod).order_by('chunk').values_list('chunk', 'lastmod'))
+
+
+def chunk_key(section, chunk):
+    return f'sitemap:{section}:{chunk}'
+
+
+def index_key(section):
+    return f'sitemap:index:{section}'
+
+
+def chunk_of(pk):
+    return (pk - 1) // settings.SITEMAP_CHUNK_SIZE
+
+
+def invalidate_chunk(section, pk):
+    cache.delete_many([chunk_key(section, chunk_of(pk)), index_key(section)])
+
+
+def build_chunk(request, section, chunk):
+    key = chunk_key(section, chunk)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    entries = SECTIONS[section]
+    lo = chunk * settings.SITEMAP_CHUNK_SIZE
+    lines = [URLSET_OPEN]
+    lastmod = None
+    for path, modified in entries(lo, lo + settings.SITEMAP_CHUNK_SIZE):
+        lines.append(f'<url><loc>{escape(request.build_absolute_uri(path))}'
+                     '</loc>')
+        if modified is not None:
+            lines.append(f'<lastmod>{modified.isoformat()}</lastmod>')
+            lastmod = max(lastmod or modified, modified)
+        lines.append('</url>\n')
+    lines.append('</urlset>\n')
+    cached = {
+        'body': ''.join(lines),
+        'lastmod': lastmod,
+        'empty': len(lines) == 2,
+    }
+    cache.set(key, cached, settings.SITEMAP_CACHE_TIMEOUT)
+    return cached
+
+
+def build_index(request):
+    lines = [INDEX_OPEN]
+    for section in SECTIONS:
+        # Индекс строится из одного агрегирующего запроса на раздел,
+        # сами части собираются лениво при обращении к ним.
+        chunks = cache.get(index_key(section))
+        if chunks is None:
+            chunks = section_chunks(section)
+            cache.set(
+                index_key(section), chunks, settings.SITEMAP_CACHE_TIMEOUT)
+        for chunk, lastmod in chunks:
+            location = request.build_absolute_uri(reverse(
+                'posts:sitemap_section', args=[section, chunk]))
+            lines.append(f'<sitemap><loc>{escape(location)}</loc>')
+            if lastmod is not None:
+                lines.append(f'<lastmod>{lastmod.isoformat()}</lastmod>')
+            lines.append('</sitemap>\n')
+    lines.append('</sitemapindex>\n')
+    return ''.join(lines)
+
+
+def index(request):
+    return HttpResponse(build_index(request), content_type='application/xml')
+
+
+def section(request, section, chunk):
+    if section not in SECTIONS:
+        raise Http404('Раздел карты сайта не найден')
+    built = build_chunk(request, section, chunk)
+    if built['empty']:
+        raise Http404('Раздел карты сайта пуст')
+    return HttpResponse(built['body'], content_type='application/xml')
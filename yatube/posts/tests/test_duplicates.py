@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..duplicates import find_duplicate
+from ..forms import PostForm
+from ..models import LshBucket, Post, PostSignature
+
+User = get_user_model()
+SPAM = ('Купите наши лучшие часы со скидкой прямо сейчас, '
+        'доставка по всей стране бесплатно и быстро')
+
+
+class DuplicatePostTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+
+    def setUp(self):
+        self.post = Post.objects.create(author=self.author, text=SPAM)
+
+    def test_signature_stored_on_save(self):
+        """При сохранении поста строится подпись и LSH-корзины."""
+        self.assertTrue(PostSignature.objects.filter(post=self.post).exists())
+        self.assertEqual(
+            LshBucket.objects.filter(post=self.post).count(), 16)
+
+    def test_near_duplicate_detected(self):
+        """Текст с мелкими правками распознаётся как дубль."""
+        self.assertEqual(find_duplicate(SPAM + '!!!'), self.post.pk)
+        self.assertEqual(
+            find_duplicate(SPAM + ' Звоните'),
+            self.post.pk)
+        self.assertIsNone(find_duplicate(SPAM, exclude=self.post.pk))
+        self.assertIsNone(find_duplicate(
+            'Сегодня гуляли в парке с собакой и кормили уток хлебом'))
+
+    def test_form_rejects_duplicate(self):
+        """Форма создания поста отклоняет почти дубль."""
+        form = PostForm(data={'text': SPAM.upper()})
+        self.assertFalse(form.is_valid())
+        self.assertIn('text', form.errors)
+        form = PostForm(data={'text': SPAM}, instance=self.post)
+        self.assertTrue(form.is_valid())
+
+    def test_create_view_rejects_duplicate(self):
+        """Дубль не сохраняется через страницу создания поста."""
+        client = Client()
+        client.force_login(self.author)
+        count = Post.objects.count()
+        client.post(reverse('posts:post_create'), {'text': SPAM})
+        self.assertEqual(Post.objects.count(), count)
+
+    def test_scan_command(self):
+        """Команда проставляет подписи и находит дубли."""
+        Post.objects.bulk_create([Post(author=self.author, text=SPAM + '?')])
+        output = StringIO()
+        call_command('scan_duplicates', stdout=output)
+        self.assertIn('Проиндексировано постов: 1', output.getvalue())
+        self.assertIn('Найдено почти одинаковых пар: 1', output.getvalue())
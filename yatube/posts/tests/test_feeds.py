@@ -0,0 +1,99 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..feeds import FEEDS_UPDATED_KEY
+from ..models import FeedStamp, Group, Post
+
+User = get_user_model()
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_contain_posts(self):
+        """Ленты RSS и Atom содержат ссылку на пост."""
+        post_url = reverse('posts:post_detail', args=[self.post.pk])
+        urls = [
+            reverse('posts:index_rss'),
+            reverse('posts:index_atom'),
+            reverse('posts:group_list_rss', args=[self.group.slug]),
+            reverse('posts:group_list_atom', args=[self.group.slug]),
+            reverse('posts:profile_rss', args=[self.author.username]),
+            reverse('posts:profile_atom', args=[self.author.username]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertIn(post_url, response.content.decode())
+
+    def test_missing_feed_object_returns_404(self):
+        """Лента несуществующей группы возвращает 404."""
+        response = self.client.get(
+            reverse('posts:group_list_rss', args=['missing']))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_missing_feed_object_not_modified(self):
+        """Условный запрос к несуществующей ленте тоже получает 404."""
+        for name, arg in (('group_list_rss', 'missing'),
+                          ('profile_atom', 'nobody')):
+            with self.subTest(name=name):
+                response = self.client.get(
+                    reverse(f'posts:{name}', args=[arg]),
+                    HTTP_IF_NONE_MATCH='*')
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_conditional_get_without_queries(self):
+        """Повторный запрос с ETag получает 304 без обращения к базе."""
+        response = self.client.get(reverse('posts:index_rss'))
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('posts:index_rss'),
+                HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_post_write_invalidates_feed(self):
+        """Новый пост меняет ETag и попадает в ленту."""
+        response = self.client.get(reverse('posts:index_rss'))
+        etag = response['ETag']
+        post = Post.objects.create(author=self.author, text='Новый пост')
+        response = self.client.get(
+            reverse('posts:index_rss'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn(
+            reverse('posts:post_detail', args=[post.pk]),
+            response.content.decode())
+
+    def test_change_from_another_process(self):
+        """Изменение, записанное другим процессом, меняет ETag."""
+        response = self.client.get(reverse('posts:index_rss'))
+        FeedStamp.objects.update(
+            updated=timezone.now() + timedelta(seconds=1))
+        # Локальная отметка истекает через FEED_STAMP_TIMEOUT.
+        cache.delete(FEEDS_UPDATED_KEY)
+        response = self.client.get(
+            reverse('posts:index_rss'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, HTTPStatus.OK)
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..follow_graph import FollowGraph, follow_graph
+from ..models import Follow
+
+User = get_user_model()
+
+
+class FollowGraphTests(TestCase):
+    def test_recommend_friends_of_friends(self):
+        """Рекомендуются авторы, на которых подписаны мои авторы."""
+        graph = FollowGraph.from_edges([(1, 2), (2, 3), (2, 4), (5, 2)])
+        self.assertEqual(set(graph.recommend(1)), {3, 4})
+
+    def test_recommend_co_follow(self):
+        """Рекомендуются авторы, которых читают мои соседи по подпискам."""
+        graph = FollowGraph.from_edges([(1, 2), (3, 2), (3, 4), (5, 2)])
+        self.assertEqual(graph.recommend(1), [4])
+
+    def test_incremental_updates(self):
+        """Граф обновляется без перестроения при подписке и отписке."""
+        graph = FollowGraph.from_edges([(1, 2), (2, 3)])
+        graph.add(2, 4)
+        graph.remove(2, 3)
+        self.assertEqual(graph.recommend(1), [4])
+        self.assertEqual(graph.authors_of(2), {4})
+        self.assertEqual(graph.followers_of(4), {2})
+
+    def test_changes_during_build_survive(self):
+        """Подписки, сделанные во время сборки графа, не теряются."""
+        graph = FollowGraph.from_edges([(1, 2), (2, 3)])
+        graph.journal = []
+        graph.add(2, 4)
+        graph.remove(2, 3)
+        graph.add(1, 2)
+        graph.load([(1, 2), (2, 3)])
+        self.assertEqual(graph.authors_of(2), {4})
+        self.assertEqual(graph.authors_of(1), {2})
+        self.assertEqual(graph.recommend(1), [4])
+
+
+class WhoToFollowViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='User')
+        cls.author = User.objects.create(username='Author')
+        cls.friend = User.objects.create(username='Friend')
+
+    def setUp(self):
+        follow_graph.following = None
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_recommendations_follow_signals(self):
+        """Новая подписка сразу попадает в рекомендации."""
+        Follow.objects.create(user=self.user, author=self.author)
+        self.authorized_client.get(reverse('posts:follow_index'))
+        Follow.objects.create(user=self.author, author=self.friend)
+        urls = [
+            reverse('posts:follow_index'),
+            reverse('posts:profile', args=[self.author.username]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertEqual(
+                    response.context['recommended'], [self.friend])
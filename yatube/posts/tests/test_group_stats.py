@@ -0,0 +1,97 @@
+from importlib import import_module
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Group, GroupAuthorStats, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+        cls.another = User.objects.create(username='Another')
+
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        self.other = Group.objects.create(
+            title='Другая группа', slug='other', description='Описание')
+
+    def stats(self, group):
+        return GroupStats.objects.values(
+            'post_count', 'author_count', 'last_post_at').get(group=group)
+
+    def test_signals_maintain_stats(self):
+        """Создание, перенос и удаление постов обновляют статистику."""
+        first = Post.objects.create(
+            author=self.author, text='Пост', group=self.group)
+        last = Post.objects.create(
+            author=self.another, text='Пост', group=self.group)
+        self.assertEqual(self.stats(self.group), {
+            'post_count': 2, 'author_count': 2,
+            'last_post_at': last.pub_date})
+        last.group = self.other
+        last.save()
+        self.assertEqual(self.stats(self.group), {
+            'post_count': 1, 'author_count': 1,
+            'last_post_at': first.pub_date})
+        self.assertEqual(self.stats(self.other)['post_count'], 1)
+        first.delete()
+        self.assertEqual(self.stats(self.group), {
+            'post_count': 0, 'author_count': 0, 'last_post_at': None})
+
+    def test_rebuild_matches_signals(self):
+        """Пересчёт командой совпадает с накопленной статистикой."""
+        Post.objects.create(author=self.author, text='1', group=self.group)
+        Post.objects.create(author=self.author, text='2', group=self.group)
+        expected = self.stats(self.group)
+        call_command('rebuild_group_stats', stdout=StringIO())
+        self.assertEqual(self.stats(self.group), expected)
+
+    def test_migration_fills_stats(self):
+        """Миграция заполняет статистику для уже существующих постов."""
+        Post.objects.create(author=self.author, text='1', group=self.group)
+        expected = self.stats(self.group)
+        GroupStats.objects.all().delete()
+        GroupAuthorStats.objects.all().delete()
+        name = '0014_auto_20261019_0651'
+        apps = MigrationLoader(connection).project_state(
+            ('posts', name)).apps
+        import_module(f'posts.migrations.{name}').build_group_stats(
+            apps, None)
+        self.assertEqual(self.stats(self.group), expected)
+        self.assertEqual(self.stats(self.other)['post_count'], 0)
+
+    def test_group_index_page(self):
+        """Каталог сообществ выводит группы по числу постов."""
+        Post.objects.create(author=self.author, text='Пост', group=self.other)
+        response = self.client.get(reverse('posts:group_index'))
+        self.assertEqual(
+            [stats.group for stats in response.context['page_obj']],
+            [self.other, self.group])
+
+    def test_group_lookup_is_cached(self):
+        """Повторный запрос группы не ищет её в базе."""
+        url = reverse('posts:group_list', args=[self.group.slug])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.context['group'], self.group)
+        self.group.slug = 'renamed'
+        self.group.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,57 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Post, PostTag
+
+User = get_user_model()
+
+
+class HashtagTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+
+    def test_tags_extracted_on_save(self):
+        """Хештеги извлекаются при сохранении и обновляются при правке."""
+        post = Post.objects.create(
+            author=self.author, text='Отпуск #Море и #солнце #море')
+        self.assertEqual(
+            set(post.tags.values_list('tag', flat=True)), {'море', 'солнце'})
+        post.text = 'Только #горы'
+        post.save()
+        self.assertEqual(list(post.tags.values_list('tag', flat=True)),
+                         ['горы'])
+
+    def test_tag_page(self):
+        """Страница хештега выводит только посты с этим тегом."""
+        tagged = Post.objects.create(author=self.author, text='Про #django')
+        Post.objects.create(author=self.author, text='Без тегов')
+        response = self.client.get(reverse('posts:tag_posts', args=['Django']))
+        self.assertEqual(list(response.context['page_obj']), [tagged])
+        self.assertContains(
+            response,
+            f'<a href="{reverse("posts:tag_posts", args=["django"])}">'
+            '#django</a>')
+
+    def test_text_is_escaped(self):
+        """Текст вокруг хештегов экранируется."""
+        post = Post.objects.create(
+            author=self.author, text="<b>'жирный'</b> #тег")
+        response = self.client.get(
+            reverse('posts:post_detail', args=[post.pk]))
+        self.assertContains(response, '&lt;b&gt;')
+        self.assertNotContains(response, '<b>')
+
+    def test_backfill_command(self):
+        """Команда заполняет хештеги для постов, созданных в обход сигналов."""
+        Post.objects.bulk_create([Post(author=self.author, text='#один')])
+        PostTag.objects.all().delete()
+        output = StringIO()
+        call_command('index_hashtags', stdout=output)
+        self.assertIn('Записано хештегов: 1', output.getvalue())
+        self.assertTrue(PostTag.objects.filter(tag='один').exists())
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..leaderboards import bucket_for, prune_buckets, top
+from ..models import Follow, Group, LeaderboardScore, Post
+
+User = get_user_model()
+
+
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+        cls.reader = User.objects.create(username='Reader')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def test_signals_update_scores(self):
+        """Посты и подписки сразу меняют рейтинги во всех окнах."""
+        post = Post.objects.create(
+            author=self.author, text='Пост', group=self.group)
+        Post.objects.create(author=self.author, text='Ещё пост')
+        Follow.objects.create(user=self.reader, author=self.author)
+        for window in ('day', 'week', 'all'):
+            with self.subTest(window=window):
+                self.assertEqual(
+                    top(LeaderboardScore.AUTHOR_POSTS, window),
+                    [(self.author, 2)])
+                self.assertEqual(
+                    top(LeaderboardScore.GROUP_POSTS, window),
+                    [(self.group, 1)])
+                self.assertEqual(
+                    top(LeaderboardScore.AUTHOR_FOLLOWERS, window),
+                    [(self.author, 1)])
+        post.delete()
+        self.assertEqual(top(LeaderboardScore.GROUP_POSTS, 'all'), [])
+
+    def test_rebuild_matches_incremental_scores(self):
+        """Пересчёт командой совпадает с накопленными значениями."""
+        Post.objects.create(author=self.author, text='Пост', group=self.group)
+        Follow.objects.create(user=self.reader, author=self.author)
+        expected = {
+            board: top(board, 'all') for board, _ in LeaderboardScore.BOARDS
+        }
+        call_command('rebuild_leaderboards', stdout=StringIO())
+        for board, scores in expected.items():
+            with self.subTest(board=board):
+                self.assertEqual(top(board, 'all'), scores)
+
+    def test_group_change_moves_score(self):
+        """Перенос поста в другую группу переносит очки группы."""
+        other = Group.objects.create(title='Другая группа', slug='other')
+        post = Post.objects.create(
+            author=self.author, text='Пост', group=self.group)
+        post.group = other
+        post.save()
+        for window in ('day', 'week', 'all'):
+            with self.subTest(window=window):
+                self.assertEqual(
+                    top(LeaderboardScore.GROUP_POSTS, window), [(other, 1)])
+
+    def test_rebuild_keeps_follower_windows(self):
+        """Пересчёт не стирает прирост подписчиков за день и неделю."""
+        Follow.objects.create(user=self.reader, author=self.author)
+        call_command('rebuild_leaderboards', stdout=StringIO())
+        for window in ('day', 'week'):
+            with self.subTest(window=window):
+                self.assertEqual(
+                    top(LeaderboardScore.AUTHOR_FOLLOWERS, window),
+                    [(self.author, 1)])
+
+    def test_prune_old_buckets(self):
+        """Устаревшие дневные и недельные корзины удаляются."""
+        old = timezone.now() - timedelta(days=60)
+        for window in ('day', 'week', 'all'):
+            LeaderboardScore.objects.create(
+                board=LeaderboardScore.AUTHOR_POSTS,
+                bucket=bucket_for(window, old),
+                object_id=self.author.pk, score=1)
+        self.assertEqual(prune_buckets(), 2)
+        self.assertEqual(
+            list(LeaderboardScore.objects.values_list('bucket', flat=True)),
+            ['all'])
+
+    def test_leaders_page(self):
+        """Страница рейтингов показывает лидеров выбранного окна."""
+        Post.objects.create(author=self.author, text='Пост')
+        response = self.client.get(reverse('posts:leaders'), {'window': 'day'})
+        self.assertEqual(response.context['window'], 'day')
+        self.assertEqual(response.context['author_posts'], [(self.author, 1)])
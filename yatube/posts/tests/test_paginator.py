@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post
+from ..utilis import WindowedPaginator, get_page_obj
+
+User = get_user_model()
+
+
+class WindowedPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Пост {i}') for i in range(25))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_elided_range(self):
+        """Диапазон страниц сворачивается вокруг текущей."""
+        paginator = WindowedPaginator(range(1000), 10)
+        self.assertEqual(
+            list(paginator.get_elided_page_range(50, 2, 1)),
+            [1, '…', 48, 49, 50, 51, 52, '…', 100])
+        self.assertEqual(
+            list(paginator.get_elided_page_range(2, 2, 1)),
+            [1, 2, 3, 4, '…', 100])
+        self.assertEqual(
+            list(WindowedPaginator(range(30), 10).get_elided_page_range(2)),
+            [1, 2, 3])
+
+    def test_cached_count(self):
+        """Кэшированный счётчик не повторяет COUNT и сбрасывается постом."""
+        request = RequestFactory().get('/')
+        posts = Post.objects.all()
+        self.assertEqual(
+            get_page_obj(posts, request, 'cached').paginator.count, 25)
+        with self.assertNumQueries(1):
+            page_obj = get_page_obj(posts, request, 'cached')
+            self.assertEqual(page_obj.paginator.count, 25)
+            list(page_obj)
+        Post.objects.create(author=self.author, text='Новый пост')
+        self.assertEqual(
+            get_page_obj(posts, request, 'cached').paginator.count, 26)
+
+    def test_approximate_falls_back(self):
+        """Без оценки планировщика используется точный подсчёт."""
+        request = RequestFactory().get('/')
+        page_obj = get_page_obj(Post.objects.all(), request, 'approximate')
+        self.assertEqual(page_obj.paginator.count, 25)
+
+    @override_settings(FIRST_PAGE_POSTS=1, PAGINATOR_ON_EACH_SIDE=1,
+                       PAGINATOR_ON_ENDS=1)
+    def test_template_renders_window(self):
+        """Шаблон выводит только окно страниц с многоточием."""
+        response = self.client.get(reverse('posts:profile', args=['Author']))
+        self.assertEqual(
+            response.context['page_obj'].page_range, [1, 2, '…', 25])
+        self.assertContains(response, '…')
+        self.assertNotContains(response, '?page=12"')
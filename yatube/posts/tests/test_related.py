@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post, RelatedPost, RelatedRefresh
+from ..related import RelatedIndex, refresh_related
+
+TEMP_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+User = get_user_model()
+
+
+@override_settings(RELATED_INDEX_PATH=os.path.join(TEMP_DIR, 'index.npz'))
+class RelatedPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def setUp(self):
+        self.cats = Post.objects.create(
+            author=self.author, text='Кошки любят спать на солнце')
+        self.more_cats = Post.objects.create(
+            author=self.author, text='Мои кошки спать любят днём')
+        self.code = Post.objects.create(
+            author=self.author, text='Django ORM и миграции базы')
+
+    def related_ids(self, post):
+        return list(RelatedPost.objects.filter(post=post).values_list(
+            'related_id', flat=True))
+
+    def test_full_rebuild(self):
+        """Полная перестройка связывает посты с общими словами."""
+        refresh_related(full=True)
+        self.assertEqual(self.related_ids(self.cats), [self.more_cats.pk])
+        self.assertEqual(self.related_ids(self.code), [])
+        self.assertFalse(RelatedRefresh.objects.exists())
+
+    def test_incremental_refresh(self):
+        """Новый пост обрабатывается без полной перестройки."""
+        refresh_related(full=True)
+        post = Post.objects.create(
+            author=self.author, text='Миграции Django без боли')
+        self.assertEqual(refresh_related(), 1)
+        self.assertEqual(self.related_ids(post), [self.code.pk])
+        self.assertEqual(self.related_ids(self.code), [post.pk])
+
+    def test_refresh_only_on_text_change(self):
+        """Пересчёт ставится в очередь только при изменении текста."""
+        refresh_related(full=True)
+        self.code.group = None
+        self.code.save()
+        self.assertFalse(RelatedRefresh.objects.exists())
+        self.code.text = 'Кошки и Django'
+        self.code.save()
+        self.assertTrue(
+            RelatedRefresh.objects.filter(post=self.code).exists())
+
+    def test_index_is_sparse(self):
+        """Индекс хранит только ненулевые веса слов."""
+        refresh_related(full=True)
+        index = RelatedIndex.load()
+        self.assertEqual(len(index.ids), 3)
+        self.assertEqual(len(index.data), len(index.indices))
+        self.assertLess(len(index.data), 20)
+
+    def test_related_panel(self):
+        """На странице поста выводится блок похожих записей."""
+        refresh_related(full=True)
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.cats.pk]))
+        self.assertEqual(response.context['related'], [self.more_cats])
+        self.assertContains(response, 'Похожие записи')
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(SITEMAP_CHUNK_SIZE=2)
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.author, text=f'Пост {i}', group=cls.group)
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_index_lists_chunks(self):
+        """Индекс карты сайта ссылается на все непустые части."""
+        content = self.client.get(reverse('posts:sitemap')).content.decode()
+        first_chunk = (self.posts[0].pk - 1) // 2
+        last_chunk = (self.posts[-1].pk - 1) // 2
+        for chunk in range(first_chunk, last_chunk + 1):
+            with self.subTest(chunk=chunk):
+                self.assertIn(
+                    reverse('posts:sitemap_section', args=['posts', chunk]),
+                    content)
+
+    def test_sections_contain_urls(self):
+        """Части карты сайта содержат адреса постов, профилей и групп."""
+        post = self.posts[0]
+        pages = {
+            ('posts', (post.pk - 1) // 2):
+                reverse('posts:post_detail', args=[post.pk]),
+            ('profiles', (self.author.pk - 1) // 2):
+                reverse('posts:profile', args=[self.author.username]),
+            ('groups', (self.group.pk - 1) // 2):
+                reverse('posts:group_list', args=[self.group.slug]),
+        }
+        for args, url in pages.items():
+            with self.subTest(section=args[0]):
+                response = self.client.get(
+                    reverse('posts:sitemap_section', args=args))
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertIn(url, response.content.decode())
+                self.assertIn('<lastmod>', response.content.decode())
+
+    def test_unknown_section_returns_404(self):
+        """Несуществующий раздел карты сайта возвращает 404."""
+        response = self.client.get(
+            reverse('posts:sitemap_section', args=['comments', 0]))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_only_changed_chunk_is_regenerated(self):
+        """Изменение поста сбрасывает только его часть карты сайта."""
+        post_id = self.posts[-1].pk
+        chunk = (post_id - 1) // 2
+        self.client.get(
+            reverse('posts:sitemap_section', args=['posts', chunk]))
+        Post.objects.get(pk=post_id).delete()
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('posts:sitemap_section', args=['posts', chunk]))
+        self.assertNotIn(
+            reverse('posts:post_detail', args=[post_id]),
+            response.content.decode())
+
+    def test_index_does_not_build_chunks(self):
+        """Индекс не собирает части: один запрос на раздел."""
+        with self.assertNumQueries(3):
+            self.client.get(reverse('posts:sitemap'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('posts:sitemap'))
+
+    @override_settings(SITEMAP_CHUNK_SIZE=1)
+    def test_group_change_invalidates_both_chunks(self):
+        """Перенос поста в другую группу сбрасывает части обеих групп."""
+        other = Group.objects.create(title='Другая', slug='other')
+        section = reverse(
+            'posts:sitemap_section',
+            args=['groups', self.group.pk - 1])
+        self.client.get(section)
+        post = self.posts[0]
+        post.group = other
+        post.save()
+        with self.assertNumQueries(1):
+            self.client.get(section)
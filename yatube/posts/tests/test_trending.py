@@ -0,0 +1,98 @@
+from datetime import timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Comment, Follow, Post, TrendingScore
+from ..trending import decay, view_buffer
+
+User = get_user_model()
+WEIGHTS = settings.TRENDING_WEIGHTS
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+        cls.user = User.objects.create(username='User')
+
+    def setUp(self):
+        view_buffer.views.clear()
+        self.quiet = Post.objects.create(author=self.user, text='Тихий пост')
+        self.hot = Post.objects.create(author=self.author, text='Горячий пост')
+
+    def score(self, post):
+        return TrendingScore.objects.get(post=post).score
+
+    def test_engagement_updates_score(self):
+        """Комментарии, подписки и просмотры повышают популярность."""
+        Comment.objects.create(post=self.hot, author=self.user, text='Ого')
+        Follow.objects.create(user=self.user, author=self.author)
+        self.client.get(reverse('posts:post_detail', args=[self.hot.pk]))
+        view_buffer.flush()
+        expected = sum(
+            WEIGHTS[event] for event in ('post', 'comment', 'follow', 'view'))
+        self.assertAlmostEqual(self.score(self.hot), expected)
+        self.assertAlmostEqual(self.score(self.quiet), WEIGHTS['post'])
+
+    def test_engagement_creates_missing_score(self):
+        """Событие у поста без записи популярности создаёт её."""
+        TrendingScore.objects.all().delete()
+        Comment.objects.create(post=self.hot, author=self.user, text='Ого')
+        Follow.objects.create(user=self.user, author=self.author)
+        self.assertAlmostEqual(
+            self.score(self.hot), WEIGHTS['comment'] + WEIGHTS['follow'])
+
+    def test_follow_skips_old_posts(self):
+        """Подписка не поднимает посты старше окна популярности."""
+        Post.objects.filter(pk=self.hot.pk).update(
+            pub_date=timezone.now() - timedelta(
+                days=settings.TRENDING_WINDOW_DAYS + 1))
+        Follow.objects.create(user=self.user, author=self.author)
+        self.assertAlmostEqual(self.score(self.hot), WEIGHTS['post'])
+
+    @override_settings(TRENDING_VIEW_BATCH=3)
+    def test_views_are_batched(self):
+        """Просмотры копятся в буфере и пишутся одной пачкой."""
+        url = reverse('posts:post_detail', args=[self.hot.pk])
+        for _ in range(2):
+            self.client.get(url)
+        self.assertAlmostEqual(self.score(self.hot), WEIGHTS['post'])
+        self.client.get(url)
+        self.assertAlmostEqual(
+            self.score(self.hot), WEIGHTS['post'] + 3 * WEIGHTS['view'])
+
+    def test_backfill_migration(self):
+        """Миграция заполняет популярность свежих постов с комментариями."""
+        Comment.objects.create(post=self.hot, author=self.user, text='Ого')
+        TrendingScore.objects.all().delete()
+        migration = import_module('posts.migrations.0018_backfill_trending')
+        migration.backfill_trending(apps, None)
+        self.assertAlmostEqual(
+            self.score(self.hot), WEIGHTS['post'] + WEIGHTS['comment'],
+            places=3)
+        self.assertAlmostEqual(self.score(self.quiet), WEIGHTS['post'],
+                               places=3)
+
+    def test_decay(self):
+        """Затухание уменьшает очки и удаляет угасшие записи."""
+        decay(settings.TRENDING_HALF_LIFE_HOURS)
+        self.assertAlmostEqual(self.score(self.hot), WEIGHTS['post'] / 2)
+        decay(settings.TRENDING_HALF_LIFE_HOURS * 100)
+        self.assertFalse(TrendingScore.objects.exists())
+
+    def test_trending_page_order(self):
+        """Вкладка популярного сортирует посты по очкам."""
+        Comment.objects.create(post=self.quiet, author=self.author, text='!')
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(reverse('posts:trending'))
+        self.assertEqual(
+            list(response.context['page_obj']), [self.quiet, self.hot])
+        self.assertTrue(response.context['trending'])
@@ -0,0 +1,89 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Follow, Post
+from ..unread import stamp_key
+
+User = get_user_model()
+
+
+# Сессия в cookie, чтобы проверять запросы без чтения django_session.
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+class UnreadPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+        cls.user = User.objects.create(username='User')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        Follow.objects.create(user=self.user, author=self.author)
+
+    def get_unread(self):
+        response = self.authorized_client.get(reverse('posts:follow_unread'))
+        return response.json()['unread']
+
+    def test_unread_counter(self):
+        """Счётчик растёт с новыми постами и сбрасывается в ленте."""
+        Post.objects.create(author=self.author, text='Пост')
+        self.assertEqual(self.get_unread(), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_unread(), 1)
+        Post.objects.create(author=self.author, text='Ещё пост')
+        self.assertEqual(self.get_unread(), 2)
+        self.authorized_client.get(reverse('posts:follow_index'))
+        self.assertEqual(self.get_unread(), 0)
+
+    def test_unread_after_cache_loss(self):
+        """Без кэша счётчик считается от отметки последнего визита."""
+        Post.objects.create(author=self.author, text='Старый пост')
+        self.authorized_client.get(reverse('posts:follow_index'))
+        Post.objects.create(author=self.author, text='Новый пост')
+        cache.clear()
+        self.assertEqual(self.get_unread(), 1)
+
+    def test_post_from_another_process(self):
+        """Пост из другого процесса попадает в счётчик в течение минуты."""
+        self.assertEqual(self.get_unread(), 0)
+        Post.objects.create(author=self.author, text='Пост')
+        # Отметка осталась в кэше другого процесса.
+        cache.delete(stamp_key(self.author.pk))
+        self.assertEqual(self.get_unread(), 0)
+        later = time.time() + 60
+        with mock.patch('time.time', return_value=later):
+            self.assertEqual(self.get_unread(), 1)
+
+    def test_publish_does_not_touch_followers(self):
+        """Публикация не обходит подписчиков, а только ставит отметку."""
+        for number in range(3):
+            reader = User.objects.create(username=f'Reader{number}')
+            Follow.objects.create(user=reader, author=self.author)
+        with CaptureQueriesContext(connection) as context:
+            Post.objects.create(author=self.author, text='Пост')
+        self.assertFalse(any(
+            'posts_follow' in query['sql'] for query in context))
+
+    def test_deleted_post_leaves_counter(self):
+        """Удалённый пост пропадает из счётчика."""
+        post = Post.objects.create(author=self.author, text='Пост')
+        self.assertEqual(self.get_unread(), 1)
+        post.delete()
+        self.assertEqual(self.get_unread(), 0)
+
+    def test_badge_in_header(self):
+        """Бейдж с числом новых постов выводится в шапке."""
+        Post.objects.create(author=self.author, text='Пост')
+        response = self.authorized_client.get(
+            reverse('posts:profile', args=[self.author.username]))
+        self.assertContains(response, 'badge bg-danger">1<')
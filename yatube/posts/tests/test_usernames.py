@@ -0,0 +1,86 @@
+import time
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Follow
+from ..usernames import resolve_username
+
+User = get_user_model()
+
+
+class UsernameLookupTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='Author')
+        cls.user = User.objects.create(username='User')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_unknown_user_404(self):
+        """Несуществующий пользователь даёт 404 на всех маршрутах."""
+        for name in ('profile', 'profile_follow', 'profile_unfollow'):
+            with self.subTest(name=name):
+                response = self.client.get(
+                    reverse(f'posts:{name}', args=['nobody']))
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_case_insensitive_redirect(self):
+        """Имя в другом регистре перенаправляет на канонический профиль."""
+        response = self.client.get(reverse('posts:profile', args=['author']))
+        self.assertRedirects(
+            response, reverse('posts:profile', args=['Author']),
+            status_code=HTTPStatus.MOVED_PERMANENTLY)
+
+    def test_cached_lookup(self):
+        """Повторный запрос не обращается к таблице пользователей."""
+        resolve_username('Author')
+        self.client.get(reverse('posts:follow_unread'))
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                resolve_username('Author'), (self.author.pk, 'Author'))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('posts:profile_follow', args=['Author']))
+        self.assertFalse(any(
+            'FROM "auth_user"' in query['sql'] for query in queries))
+        self.assertTrue(Follow.objects.filter(
+            user=self.user, author=self.author).exists())
+
+    def test_rename_invalidates(self):
+        """После переименования старое имя больше не находится."""
+        resolve_username('Author')
+        self.author.username = 'Renamed'
+        self.author.save()
+        response = self.client.get(reverse('posts:profile', args=['Author']))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.author.username = 'Author'
+        self.author.save()
+
+    def test_rename_in_another_process(self):
+        """Имя, освобождённое в другом процессе, находится через минуту."""
+        resolve_username('Author')
+        # update() не шлёт сигналов, как и переименование в другом процессе.
+        User.objects.filter(pk=self.author.pk).update(username='Renamed')
+        newcomer = User.objects.create(username='Newcomer')
+        User.objects.filter(pk=newcomer.pk).update(username='Author')
+        later = time.time() + 60
+        with mock.patch('time.time', return_value=later):
+            self.assertEqual(
+                resolve_username('Author'), (newcomer.pk, 'Author'))
+
+    def test_lower_index_exists(self):
+        """Регистронезависимый поиск опирается на функциональный индекс."""
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(
+                cursor, 'auth_user')
+        self.assertIn('auth_user_username_lower', indexes)
@@ -8,11 +8,15 @@ from django.conf import settings as s
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from ..follows import follow_authors
 from ..forms import PostForm
-from ..models import Follow, Group, Post
+from ..leaderboards import top
+from ..models import Follow, Group, LeaderboardScore, Post
 
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=s.BASE_DIR)
 
@@ -222,6 +226,60 @@ class PostViewTests(TestCase):
                     kwargs={'username': self.author.username}))
         self.assertEqual(Follow.objects.count(), follow_count - 1)
 
+    def test_follow_is_idempotent(self):
+        """Повторная подписка не создаёт дублей."""
+        url = reverse('posts:profile_follow',
+                      kwargs={'username': self.author.username})
+        self.authorized_client_2.get(url)
+        self.authorized_client_2.get(url)
+        self.assertEqual(
+            Follow.objects.filter(user=self.user, author=self.author).count(),
+            1)
+
+    def test_ajax_follow_returns_followers_count(self):
+        """AJAX-подписка возвращает актуальное число подписчиков."""
+        urls = {
+            'posts:profile_follow': {'following': True, 'followers': 1},
+            'posts:profile_unfollow': {'following': False, 'followers': 0},
+        }
+        for name, expected in urls.items():
+            with self.subTest(name=name):
+                response = self.authorized_client_2.get(
+                    reverse(name, kwargs={'username': self.author.username}),
+                    HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+                self.assertEqual(response.json(), expected)
+
+    def test_follow_import(self):
+        """Импорт списка подписок пропускает себя, дубли и неизвестных."""
+        Follow.objects.create(user=self.user, author=self.author)
+        another = User.objects.create(username='Another')
+        response = self.authorized_client_2.post(
+            reverse('posts:follow_import'),
+            {'usernames': 'Author, Another\nUser missing Another'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.json(), {'created': 1})
+        self.assertEqual(
+            set(self.user.follower.values_list('author', flat=True)),
+            {self.author.pk, another.pk})
+
+    def test_follow_import_batches_updates(self):
+        """Число запросов импорта не зависит от числа авторов."""
+        authors = [User.objects.create(username=f'Many{i}') for i in range(7)]
+        queries = []
+        # Первый импорт прогревает ежедневную очистку рейтингов.
+        batches = (authors[:1], authors[1:2], authors[2:])
+        for number, batch in enumerate(batches):
+            user = User.objects.create(username=f'Reader{number}')
+            usernames = [author.username for author in batch]
+            with CaptureQueriesContext(connection) as context:
+                created = follow_authors(user, usernames)
+            self.assertEqual(len(created), len(batch))
+            queries.append(len(context))
+        self.assertEqual(queries[1], queries[2])
+        self.assertEqual(
+            dict(top(LeaderboardScore.AUTHOR_FOLLOWERS, 'all')),
+            dict.fromkeys(authors, 1))
+
     def test_follow_posts_appear_at_user_follow_page(self):
         """Проверка появления записей в ленте тех, кто подписан."""
         post = Post.objects.create(
@@ -282,3 +340,31 @@ class PaginatorViewsTest(TestCase):
                 self.assertEqual(len(self.client.get(
                     responce + '?page=2').context.get('page_obj')),
                     self.SECOND_PAGE_POSTS)
+
+    def test_more_returns_next_batch(self):
+        """Частичная выдача продолжает ленту с места курсора."""
+        cache.clear()
+        url_pages = {
+            reverse('posts:index'): reverse('posts:index_more'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}):
+                reverse('posts:group_list_more',
+                        kwargs={'slug': self.group.slug}),
+            reverse('posts:profile',
+                    kwargs={'username': self.author.username}):
+                reverse('posts:profile_more',
+                        kwargs={'username': self.author.username}),
+        }
+        for url, more_url in url_pages.items():
+            with self.subTest(url=url):
+                cursor = self.client.get(url).context['next_cursor']
+                response = self.client.get(more_url, {'cursor': cursor})
+                self.assertEqual(
+                    len(response.context['posts']), self.SECOND_PAGE_POSTS)
+                self.assertNotIn('X-Next-Cursor', response)
+                self.assertTemplateNotUsed(response, 'base.html')
+
+    def test_more_rejects_bad_cursor(self):
+        """Некорректный курсор возвращает 400."""
+        response = self.client.get(
+            reverse('posts:index_more'), {'cursor': 'broken'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
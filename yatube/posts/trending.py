@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Post, TrendingScore
+
+
+def window_start():
+    return timezone.now() - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+
+
+def add_score(post_id, score):
+    scores = TrendingScore.objects.filter(post_id=post_id)
+    if scores.update(score=F('score') + score):
+        return
+    _, created = TrendingScore.objects.get_or_create(
+        post_id=post_id, defaults={'score': score})
+    if not created:
+        scores.update(score=F('score') + score)
+
+
+def add_engagement(event, post_ids, count=1):
+    # Записи нет у постов до появления таблицы и у угасших постов,
+    # поэтому очки добавляются через upsert.
+    score = settings.TRENDING_WEIGHTS[event] * count
+    scores = TrendingScore.objects.filter(post_id__in=post_ids)
+    existing = set(scores.values_list('post_id', flat=True))
+    scores.filter(post_id__in=existing).update(score=F('score') + score)
+    missing = set(post_ids) - existing
+    try:
+        with transaction.atomic():
+            TrendingScore.objects.bulk_create(
+                TrendingScore(post_id=post_id, score=score)
+                for post_id in missing)
+    except IntegrityError:
+        for post_id in missing:
+            add_score(post_id, score)
+
+
+def post_published(post):
+    TrendingScore.objects.create(
+        post=post, score=settings.TRENDING_WEIGHTS['post'])
+
+
+def comment_added(comment):
+    if comment.post.pub_date >= window_start():
+        add_score(comment.post_id, settings.TRENDING_WEIGHTS['comment'])
+
+
+def authors_followed(author_ids):
+    post_ids = Post.objects.filter(
+        author_id__in=author_ids, pub_date__gte=window_start()
+    ).values_list('id', flat=True)
+    add_engagement('follow', list(post_ids))
+
+
+class ViewBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = Counter()
+        self.flushed_at = time.monotonic()
+
+    def add(self, post_id):
+        with self.lock:
+            self.views[post_id] += 1
+            if (
+                sum(self.views.values()) < settings.TRENDING_VIEW_BATCH
+                and time.monotonic() - self.flushed_at
+                < settings.TRENDING_VIEW_FLUSH_SECONDS
+            ):
+                return
+        self.flush()
+
+    def flush(self):
+        with self.lock:
+            views, self.views = self.views, Counter()
+            self.flushed_at = time.monotonic()
+        # Пост мог быть удалён, пока просмотры лежали в буфере.
+        existing = Post.objects.filter(pk__in=views).values_list(
+            'pk', flat=True)
+        by_count = defaultdict(list)
+        for post_id in existing:
+            by_count[views[post_id]].append(post_id)
+        for count, post_ids in by_count.items():
+            add_engagement('view', post_ids, count)
+
+
+view_buffer = ViewBuffer()
+
+
+def post_viewed(post):
+    if post.pub_date >= window_start():
+        view_buffer.add(post.pk)
+
+
+def decay(hours):
+    view_buffer.flush()
+    factor = 0.5 ** (hours / settings.TRENDING_HALF_LIFE_HOURS)
+    TrendingScore.objects.update(score=F('score') * factor)
+    deleted, _ = TrendingScore.objects.filter(
+        score__lt=settings.TRENDING_MIN_SCORE).delete()
+    return deleted
+
+
+def trending_posts():
+    return Post.objects.filter(trending__isnull=False).select_related(
+        'author', 'group').order_by('-trending__score', '-pub_date')
@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import FeedVisit, Follow, Post
+
+
+def unread_key(user_id):
+    return f'follow:unread:{user_id}'
+
+
+def authors_key(user_id):
+    return f'follow:authors:{user_id}'
+
+
+def stamp_key(author_id):
+    return f'follow:stamp:{author_id}'
+
+
+def followed_authors(user_id):
+    key = authors_key(user_id)
+    authors = cache.get(key)
+    if authors is None:
+        authors = list(Follow.objects.filter(
+            user_id=user_id, author__isnull=False
+        ).values_list('author_id', flat=True))
+        cache.set(key, authors, settings.UNREAD_CACHE_TIMEOUT)
+    return authors
+
+
+def unread_count(user):
+    # Счётчик пересчитывается при чтении, если у кого-то из авторов отметка
+    # последнего поста новее сохранённого значения или истёк его короткий
+    # срок: отметки из других процессов сюда не попадают.
+    key = unread_key(user.pk)
+    cached = cache.get(key)
+    authors = followed_authors(user.pk)
+    stamps = cache.get_many([stamp_key(author) for author in authors])
+    if cached is not None and max(stamps.values(), default=0) < cached[1]:
+        return cached[0]
+    computed_at = time.time()
+    posts = Post.objects.filter(author_id__in=authors)
+    seen_at = FeedVisit.objects.filter(user=user).values_list(
+        'seen_at', flat=True).first()
+    if seen_at:
+        posts = posts.filter(pub_date__gt=seen_at)
+    count = posts.count()
+    cache.set(key, (count, computed_at), settings.UNREAD_CACHE_TIMEOUT)
+    return count
+
+
+def mark_seen(user):
+    now = timezone.now()
+    if not FeedVisit.objects.filter(user=user).update(seen_at=now):
+        FeedVisit.objects.get_or_create(user=user, defaults={'seen_at': now})
+    cache.set(
+        unread_key(user.pk), (0, now.timestamp()),
+        settings.UNREAD_CACHE_TIMEOUT)
+
+
+def author_posts_changed(author_id):
+    cache.set(
+        stamp_key(author_id), time.time(), settings.UNREAD_CACHE_TIMEOUT)
+
+
+def reset_unread(user_id):
+    cache.delete_many([unread_key(user_id), authors_key(user_id)])
@@ -1,13 +1,58 @@
 from django.urls import path
 
-from . import views
+from . import feeds, sitemaps, views
 
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('more/', views.index_more, name='index_more'),
+    path('sitemap.xml', sitemaps.index, name='sitemap'),
+    path(
+        'sitemap-<str:section>-<int:chunk>.xml',
+        sitemaps.section,
+        name='sitemap_section'
+    ),
+    path('rss/', feeds.cached_feed(feeds.LatestPostsFeed()), name='index_rss'),
+    path(
+        'atom/',
+        feeds.cached_feed(feeds.LatestPostsAtomFeed()),
+        name='index_atom'
+    ),
+    path('groups/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path(
+        'group/<slug:slug>/more/',
+        views.group_posts_more,
+        name='group_list_more'
+    ),
+    path(
+        'group/<slug:slug>/rss/',
+        feeds.cached_feed(feeds.GroupPostsFeed()),
+        name='group_list_rss'
+    ),
+    path(
+        'group/<slug:slug>/atom/',
+        feeds.cached_feed(feeds.GroupPostsAtomFeed()),
+        name='group_list_atom'
+    ),
+    path('tag/<str:tag>/', views.tag_posts, name='tag_posts'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/more/',
+        views.profile_more,
+        name='profile_more'
+    ),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.cached_feed(feeds.AuthorPostsFeed()),
+        name='profile_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.cached_feed(feeds.AuthorPostsAtomFeed()),
+        name='profile_atom'
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
@@ -16,6 +61,11 @@ urlpatterns = [
         views.add_comment,
         name='add_comment'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('leaders/', views.leaders, name='leaders'),
+    path('trending/', views.trending, name='trending'),
+    path('follow/more/', views.follow_index_more, name='follow_index_more'),
+    path('follow/import/', views.follow_import, name='follow_import'),
+    path('follow/unread/', views.follow_unread, name='follow_unread'),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
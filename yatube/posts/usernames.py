@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Lower
+from django.http import Http404
+
+from .models import User
+
+
+def username_key(username):
+    return f'username:{username}'
+
+
+def resolve_username(username):
+    user_id = cache.get(username_key(username))
+    if user_id is not None:
+        return user_id, username
+    user = User.objects.filter(username=username).values_list(
+        'id', 'username').first()
+    if user is None:
+        # Использует индекс auth_user_username_lower из миграции
+        # users/0003_username_lower_index.
+        user = User.objects.annotate(lower=Lower('username')).filter(
+            lower=username.lower()).order_by('pk').values_list(
+            'id', 'username').first()
+    if user is None:
+        raise Http404('Пользователь не найден')
+    if user[1] == username:
+        cache.set(username_key(username), user[0],
+                  settings.USERNAME_CACHE_TIMEOUT)
+    return user
+
+
+def forget_username(*usernames):
+    cache.delete_many(
+        [username_key(username) for username in usernames if username])
@@ -1,9 +1,125 @@
+import base64
+import hashlib
+import re
+
+from django.core.cache import cache
 from django.core.paginator import Paginator
 from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .feeds import feeds_updated
+
+PLAN_ROWS_RE = re.compile(r'rows=(\d+)')
+
+
+class WindowedPaginator(Paginator):
+    ELLIPSIS = '…'
+
+    def __init__(self, object_list, per_page, strategy='exact', **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.strategy = strategy
+
+    @cached_property
+    def count(self):
+        if self.strategy == 'exact' or not hasattr(self.object_list, 'query'):
+            return super().count
+        if self.strategy == 'approximate':
+            estimate = self.estimated_count()
+            if estimate is not None and (
+                    estimate >= settings.PAGINATOR_APPROXIMATE_FROM):
+                return estimate
+        return self.cached_count()
+
+    def cached_count(self):
+        sql = str(self.object_list.query).encode()
+        key = 'page-count:{}:{}'.format(
+            feeds_updated(), hashlib.md5(sql).hexdigest())
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, settings.PAGINATOR_COUNT_TIMEOUT)
+        return count
+
+    def estimated_count(self):
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+        sql, params = self.object_list.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN ' + sql, params)
+            match = PLAN_ROWS_RE.search(cursor.fetchone()[0])
+        return int(match.group(1)) if match else None
+
+    def get_elided_page_range(self, number=1, on_each_side=3, on_ends=2):
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > 1 + on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1, self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
 
 
-def get_page_obj(posts, request):
-    paginator = Paginator(posts, settings.FIRST_PAGE_POSTS)
+def get_page_obj(posts, request, strategy='exact'):
+    paginator = WindowedPaginator(
+        posts, settings.FIRST_PAGE_POSTS, strategy=strategy)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    page_obj.page_range = list(paginator.get_elided_page_range(
+        page_obj.number, on_each_side=settings.PAGINATOR_ON_EACH_SIDE,
+        on_ends=settings.PAGINATOR_ON_ENDS))
     return page_obj
+
+
+def encode_cursor(pub_date, pk):
+    raw = f'{pub_date.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        pub_date, pk = raw.rsplit('|', 1)
+        pub_date, pk = parse_datetime(pub_date), int(pk)
+    except ValueError:
+        pub_date = None
+    if pub_date is None:
+        raise ValueError('Некорректный курсор')
+    return pub_date, pk
+
+
+def after_cursor(posts, cursor):
+    posts = posts.order_by('-pub_date', '-id')
+    if not cursor:
+        return posts
+    pub_date, pk = decode_cursor(cursor)
+    return posts.filter(
+        Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk))
+
+
+def get_next_cursor(page_obj):
+    if not page_obj.has_next():
+        return None
+    last = page_obj.object_list[len(page_obj.object_list) - 1]
+    return encode_cursor(last.pub_date, last.pk)
+
+
+def get_cursor_batch(posts, request):
+    posts = list(after_cursor(posts, request.GET.get('cursor'))[
+        :settings.FIRST_PAGE_POSTS + 1])
+    if len(posts) <= settings.FIRST_PAGE_POSTS:
+        return posts, None
+    posts = posts[:settings.FIRST_PAGE_POSTS]
+    return posts, encode_cursor(posts[-1].pub_date, posts[-1].pk)
@@ -1,48 +1,147 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.db import IntegrityError, transaction
+from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.cache import cache_page
 
-from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post, User
-from .utilis import get_page_obj
+from users.backends import get_cached_user
+
+from .follow_graph import recommend_authors
+from .follows import follow_authors
+from .forms import CommentForm, FollowImportForm, PostForm
+from .group_stats import get_group
+from .leaderboards import WINDOWS, top
+from .models import Follow, GroupStats, LeaderboardScore, Post
+from .related import related_posts
+from .trending import post_viewed, trending_posts
+from .unread import mark_seen, unread_count
+from .usernames import resolve_username
+from .utilis import get_cursor_batch, get_next_cursor, get_page_obj
+
+
+def render_more(request, posts):
+    try:
+        posts, next_cursor = get_cursor_batch(posts, request)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    response = render(
+        request, 'posts/includes/post_list.html', {'posts': posts})
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
 
 
 @cache_page(20, key_prefix="index_page")
 def index(request):
     page_obj = get_page_obj(
-        Post.objects.select_related('author', 'group').all(), request)
-    context = {'page_obj': page_obj}
+        Post.objects.select_related('author', 'group').all(), request,
+        strategy='approximate')
+    context = {
+        'page_obj': page_obj,
+        'next_cursor': get_next_cursor(page_obj)
+    }
     return render(request, 'posts/index.html', context)
 
 
+def index_more(request):
+    return render_more(
+        request, Post.objects.select_related('author', 'group'))
+
+
+@cache_page(settings.GROUPS_CACHE_TIMEOUT, key_prefix='groups_page')
+def group_index(request):
+    page_obj = get_page_obj(
+        GroupStats.objects.select_related('group'), request)
+    context = {'page_obj': page_obj}
+    return render(request, 'posts/groups.html', context)
+
+
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    page_obj = get_page_obj(group.posts.all(), request)
-    context = {'page_obj': page_obj, 'group': group}
+    group = get_group(slug)
+    page_obj = get_page_obj(
+        Post.objects.filter(group=group), request, strategy='cached')
+    context = {
+        'page_obj': page_obj,
+        'group': group,
+        'next_cursor': get_next_cursor(page_obj)
+    }
     return render(request, 'posts/group_list.html', context)
 
 
+def group_posts_more(request, slug):
+    group = get_group(slug)
+    return render_more(
+        request, Post.objects.filter(group=group).select_related('author'))
+
+
+def tag_posts(request, tag):
+    tag = tag.lower()
+    page_obj = get_page_obj(
+        Post.objects.filter(tags__tag=tag).select_related(
+            'author', 'group').order_by('-tags__pub_date'),
+        request,
+        strategy='cached'
+    )
+    context = {'page_obj': page_obj, 'tag': tag}
+    return render(request, 'posts/tag_list.html', context)
+
+
 def profile(request, username):
-    author = User.objects.get(username=username)
-    page_obj = get_page_obj(Post.objects.filter(author=author), request)
+    author_id, canonical = resolve_username(username)
+    if canonical != username:
+        return redirect('posts:profile', username=canonical, permanent=True)
+    author = get_cached_user(author_id)
+    page_obj = get_page_obj(
+        Post.objects.filter(author_id=author_id), request, strategy='cached')
     following = (request.user.is_authenticated and Follow.objects.filter(
                  author=author, user=request.user).exists())
     context = {
         'page_obj': page_obj,
         'author': author,
-        'following': following
+        'following': following,
+        'next_cursor': get_next_cursor(page_obj),
+        'recommended': recommend_authors(request.user)
     }
     return render(request, 'posts/profile.html', context)
 
 
+def profile_more(request, username):
+    author_id, _ = resolve_username(username)
+    return render_more(request, Post.objects.filter(
+        author_id=author_id).select_related('group'))
+
+
+def trending(request):
+    page_obj = get_page_obj(trending_posts(), request, strategy='cached')
+    context = {'page_obj': page_obj, 'trending': True}
+    return render(request, 'posts/trending.html', context)
+
+
+def leaders(request):
+    window = request.GET.get('window', 'week')
+    if window not in WINDOWS:
+        window = 'week'
+    context = {
+        'window': window,
+        'windows': WINDOWS,
+        'author_posts': top(LeaderboardScore.AUTHOR_POSTS, window),
+        'author_followers': top(LeaderboardScore.AUTHOR_FOLLOWERS, window),
+        'group_posts': top(LeaderboardScore.GROUP_POSTS, window),
+    }
+    return render(request, 'posts/leaders.html', context)
+
+
 def post_detail(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
+    post_viewed(post)
     form = CommentForm(request.POST or None)
     comments = post.comments.all()
     context = {
         'post': post,
         'form': form,
-        'comments': comments
+        'comments': comments,
+        'related': related_posts(post)
     }
     return render(request, 'posts/post_detail.html', context)
 
@@ -93,25 +192,64 @@ def add_comment(request, post_id):
 def follow_index(request):
     page_obj = get_page_obj(
         Post.objects.filter(author__following__user=request.user), request)
-    context = {'page_obj': page_obj}
+    context = {
+        'page_obj': page_obj,
+        'next_cursor': get_next_cursor(page_obj),
+        'recommended': recommend_authors(request.user)
+    }
+    mark_seen(request.user)
     return render(request, 'posts/follow.html', context)
 
 
 @login_required
-def profile_follow(request, username):
-    author = get_object_or_404(User, username=username)
-    if author != request.user:
-        if not Follow.objects.filter(
-                user=request.user, author=author).exists():
-            Follow.objects.create(user=request.user, author=author)
-            return redirect('posts:profile', username=username)
-        Follow.objects.get(user=request.user, author=author)
-        return redirect('posts:profile', username=username)
+def follow_unread(request):
+    return JsonResponse({'unread': unread_count(request.user)})
+
+
+@login_required
+def follow_index_more(request):
+    return render_more(
+        request,
+        Post.objects.select_related('author', 'group').filter(
+            author__following__user=request.user)
+    )
+
+
+def follow_response(request, author_id, username, following):
+    if request.is_ajax():
+        return JsonResponse({
+            'following': following,
+            'followers': Follow.objects.filter(author_id=author_id).count(),
+        })
     return redirect('posts:profile', username=username)
 
 
+@login_required
+def profile_follow(request, username):
+    author_id, username = resolve_username(username)
+    if author_id == request.user.pk:
+        return follow_response(request, author_id, username, False)
+    try:
+        with transaction.atomic():
+            Follow.objects.create(user=request.user, author_id=author_id)
+    except IntegrityError:
+        pass
+    return follow_response(request, author_id, username, True)
+
+
 @login_required
 def profile_unfollow(request, username):
-    author = get_object_or_404(User, username=username)
-    Follow.objects.filter(user=request.user, author=author).delete()
-    return redirect('posts:profile', username=username)
+    author_id, username = resolve_username(username)
+    Follow.objects.filter(user=request.user, author_id=author_id).delete()
+    return follow_response(request, author_id, username, False)
+
+
+@login_required
+def follow_import(request):
+    form = FollowImportForm(request.POST or None)
+    if form.is_valid():
+        created = follow_authors(request.user, form.cleaned_data['usernames'])
+        if request.is_ajax():
+            return JsonResponse({'created': len(created)})
+        return redirect('posts:follow_index')
+    return render(request, 'posts/follow_import.html', {'form': form})
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+User = get_user_model()
+
+
+def user_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_user(*user_ids):
+    # Сигналы сбрасывают кэш при save() и delete(); после QuerySet.update()
+    # по пользователям вызывайте forget_user(*ids) явно.
+    cache.delete_many([user_key(user_id) for user_id in user_ids])
+
+
+def get_cached_user(user_id):
+    key = user_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User._default_manager.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        user = get_cached_user(user_id)
+        if user is None or not self.user_can_authenticate(user):
+            return None
+        return user
@@ -0,0 +1,154 @@
+import base64
+import json
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def join_addresses(addresses):
+    return '\n'.join(addresses)
+
+
+def split_addresses(text):
+    return [address for address in text.split('\n') if address]
+
+
+def dump_attachment(attachment):
+    if isinstance(attachment, tuple):
+        filename, content, mimetype = attachment
+    else:
+        filename = attachment.get_filename()
+        content = attachment.get_payload(decode=True)
+        mimetype = attachment.get_content_type()
+    if isinstance(content, str):
+        content = content.encode()
+    return {
+        'filename': filename,
+        'content': base64.b64encode(content).decode(),
+        'mimetype': mimetype,
+    }
+
+
+class OutboxBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        OutboxEmail.objects.bulk_create(
+            OutboxEmail(
+                subject=message.subject,
+                body=message.body,
+                html_body=next((
+                    content
+                    for content, mimetype in getattr(
+                        message, 'alternatives', [])
+                    if mimetype == 'text/html'), ''),
+                from_email=message.from_email,
+                to=join_addresses(message.to),
+                cc=join_addresses(message.cc),
+                bcc=join_addresses(message.bcc),
+                reply_to=join_addresses(message.reply_to),
+                headers=json.dumps(message.extra_headers),
+                attachments=json.dumps(
+                    [dump_attachment(item) for item in message.attachments]),
+            )
+            for message in email_messages
+        )
+        return len(email_messages)
+
+
+def pending():
+    return OutboxEmail.objects.filter(
+        sent__isnull=True, attempts__lt=settings.OUTBOX_MAX_ATTEMPTS)
+
+
+def queue_depth():
+    return {
+        'pending': pending().count(),
+        'due': pending().filter(next_attempt__lte=timezone.now()).count(),
+        'failed': OutboxEmail.objects.filter(
+            sent__isnull=True,
+            attempts__gte=settings.OUTBOX_MAX_ATTEMPTS).count(),
+    }
+
+
+def build_message(email, connection):
+    message = EmailMultiAlternatives(
+        email.subject, email.body, email.from_email,
+        to=split_addresses(email.to),
+        cc=split_addresses(email.cc),
+        bcc=split_addresses(email.bcc),
+        reply_to=split_addresses(email.reply_to),
+        headers=json.loads(email.headers),
+        connection=connection)
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    for attachment in json.loads(email.attachments):
+        message.attach(
+            attachment['filename'],
+            base64.b64decode(attachment['content']),
+            attachment['mimetype'])
+    return message
+
+
+def claim(batch_size):
+    # Письма забираются одним UPDATE: next_attempt сдвигается на срок
+    # аренды, поэтому другой обработчик их уже не выберет, а после
+    # падения обработчика они снова станут доступны.
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    due = pending().filter(next_attempt__lte=now)
+    ids = list(due.values_list('id', flat=True)[:batch_size])
+    due.filter(id__in=ids).update(
+        claim=token,
+        next_attempt=now + timedelta(seconds=settings.OUTBOX_LEASE))
+    return list(OutboxEmail.objects.filter(claim=token))
+
+
+def record(email, error=None):
+    email.attempts += 1
+    if error is None:
+        email.sent = timezone.now()
+    else:
+        email.last_error = repr(error)
+        email.next_attempt = timezone.now() + timedelta(
+            seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1))
+    email.claim = ''
+    email.save(update_fields=(
+        'attempts', 'last_error', 'next_attempt', 'sent', 'claim'))
+
+
+def deliver(batch_size):
+    batch = claim(batch_size)
+    if not batch:
+        return 0, 0
+    connection = get_connection(settings.OUTBOX_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        # Без соединения попыткой считается вся пачка, иначе письма
+        # ждали бы конца аренды без записи об ошибке.
+        for email in batch:
+            record(email, error)
+        return 0, len(batch)
+    sent = failed = 0
+    try:
+        for email in batch:
+            try:
+                build_message(email, connection).send()
+            except Exception as error:
+                record(email, error)
+                failed += 1
+            else:
+                record(email)
+                sent += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            # Результаты уже записаны, ошибка закрытия на них не влияет.
+            pass
+    return sent, failed
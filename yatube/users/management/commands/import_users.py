@@ -0,0 +1,136 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+User = get_user_model()
+FIELDS = ('username', 'email', 'first_name', 'last_name')
+
+
+def read_rows(path, file_format):
+    with open(path, encoding='utf-8', newline='') as source:
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+        else:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def batches(rows, size):
+    rows = iter(rows)
+    batch = list(islice(rows, size))
+    while batch:
+        yield batch
+        batch = list(islice(rows, size))
+
+
+class Command(BaseCommand):
+    help = ('Создаёт пользователей из CSV или JSONL пачками; пароли '
+            'хэшируются в пуле процессов, готовые хэши берутся как есть')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=('csv', 'jsonl'))
+        parser.add_argument(
+            '--batch', type=int, default=settings.USER_IMPORT_BATCH)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Процессов для хэширования; 0 — хэшировать в текущем')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or (
+            'csv' if path.endswith('.csv') else 'jsonl')
+        pool = None
+        if options['workers']:
+            pool = ProcessPoolExecutor(
+                options['workers'], initializer=django.setup)
+        started = time.perf_counter()
+        total = skipped = 0
+        try:
+            for rows in batches(
+                    read_rows(path, file_format), options['batch']):
+                created = self.create_users(self.build_users(rows, pool))
+                total += created
+                skipped += len(rows) - created
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'Обработано: {total}, {total / elapsed:.0f} в секунду')
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        self.stdout.write(
+            f'Импортировано: {total}, пропущено: {skipped}, '
+            f'{time.perf_counter() - started:.1f} с')
+
+    def create_users(self, users):
+        # Без ignore_conflicts в счёт попадают только вставленные строки.
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+        except IntegrityError:
+            # Имя заняли параллельно, пока хэшировались пароли.
+            existing = set(User.objects.filter(
+                username__in=[user.username for user in users]
+            ).values_list('username', flat=True))
+            users = [user for user in users if user.username not in existing]
+            User.objects.bulk_create(users)
+        return len(users)
+
+    def parse_row(self, row, seen):
+        user = User(**{field: row.get(field) or '' for field in FIELDS})
+        try:
+            user.clean_fields(exclude=('password',))
+            if user.username in seen:
+                raise ValidationError('имя повторяется в файле')
+            user.password = row.get('password_hash') or ''
+            if user.password:
+                try:
+                    identify_hasher(user.password)
+                except ValueError:
+                    raise ValidationError('неизвестный формат хэша пароля')
+        except ValidationError as error:
+            self.stderr.write(f'{row.get("username")!r}: {error}')
+            return None
+        seen.add(user.username)
+        return user
+
+    def build_users(self, rows, pool):
+        users, passwords, seen = [], [], set()
+        existing = set(User.objects.filter(
+            username__in=[row.get('username') for row in rows]
+        ).values_list('username', flat=True))
+        for row in rows:
+            if row.get('username') in existing:
+                self.stderr.write(
+                    f'{row.get("username")!r}: пользователь уже есть')
+                continue
+            user = self.parse_row(row, seen)
+            if user is None:
+                continue
+            users.append(user)
+            passwords.append(
+                None if user.password else row.get('password') or None)
+        pending = [index for index, raw in enumerate(passwords) if raw]
+        raw = [passwords[index] for index in pending]
+        hashed = (pool.map(make_password, raw, chunksize=16) if pool
+                  else map(make_password, raw))
+        for index, password in zip(pending, hashed):
+            users[index].password = password
+        for user in users:
+            if not user.password:
+                user.set_unusable_password()
+        return users
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.mail import deliver, queue_depth
+
+
+class Command(BaseCommand):
+    help = ('Отправляет письма из очереди пачками через одно соединение; '
+            'неудачные повторяет с растущей задержкой')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch', type=int, default=settings.OUTBOX_BATCH)
+        parser.add_argument(
+            '--forever', action='store_true',
+            help='Не завершаться, проверять очередь каждые --interval с')
+        parser.add_argument('--interval', type=float, default=5)
+        parser.add_argument(
+            '--depth', action='store_true',
+            help='Только показать размер очереди')
+
+    def report(self):
+        depth = queue_depth()
+        self.stdout.write(
+            'В очереди: {pending}, к отправке: {due}, '
+            'не доставлено: {failed}'.format(**depth))
+
+    def handle(self, *args, **options):
+        if options['depth']:
+            self.report()
+            return
+        while True:
+            try:
+                sent, failed = deliver(options['batch'])
+            except Exception as error:
+                if not options['forever']:
+                    raise
+                # Сбой одной пачки не должен останавливать обработчик.
+                self.stderr.write(f'Ошибка отправки: {error!r}')
+                sent = failed = 0
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, ошибок: {failed}')
+                continue
+            if not options['forever']:
+                break
+            time.sleep(options['interval'])
+        self.report()
@@ -0,0 +1,60 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:33
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_recipients(apps, schema_editor):
+    # Старые письма хранили общий список адресов, он уходит в «Кому».
+    OutboxEmail = apps.get_model('users', 'OutboxEmail')
+    OutboxEmail.objects.update(to=F('recipients'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='attachments',
+            field=models.TextField(default='[]', verbose_name='Вложения, JSON'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='bcc',
+            field=models.TextField(blank=True, verbose_name='Скрытая копия'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='cc',
+            field=models.TextField(blank=True, verbose_name='Копия'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claim',
+            field=models.CharField(blank=True, db_index=True, max_length=32, verbose_name='Метка обработчика'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='headers',
+            field=models.TextField(default='{}', verbose_name='Заголовки, JSON'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='reply_to',
+            field=models.TextField(blank=True, verbose_name='Адрес для ответа'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='to',
+            field=models.TextField(blank=True, verbose_name='Кому'),
+        ),
+        migrations.RunPython(copy_recipients, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='outboxemail',
+            name='recipients',
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-19 06:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('users', '0002_outbox_message_fields'),
+    ]
+
+    # Индекс мог быть создан прежней миграцией posts.0016.
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS auth_user_username_lower '
+            'ON auth_user (LOWER(username));',
+            'DROP INDEX IF EXISTS auth_user_username_lower;',
+        ),
+    ]
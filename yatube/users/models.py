@@ -0,0 +1,27 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEmail(models.Model):
+    subject = models.CharField('Тема', max_length=998)
+    body = models.TextField('Текст')
+    html_body = models.TextField('HTML-версия', blank=True)
+    from_email = models.CharField('Отправитель', max_length=254)
+    to = models.TextField('Кому', blank=True)
+    cc = models.TextField('Копия', blank=True)
+    bcc = models.TextField('Скрытая копия', blank=True)
+    reply_to = models.TextField('Адрес для ответа', blank=True)
+    headers = models.TextField('Заголовки, JSON', default='{}')
+    attachments = models.TextField('Вложения, JSON', default='[]')
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+    next_attempt = models.DateTimeField(
+        'Следующая попытка', default=timezone.now)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    sent = models.DateTimeField('Дата отправки', null=True, blank=True)
+    claim = models.CharField(
+        'Метка обработчика', max_length=32, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ('next_attempt',)
+        indexes = [models.Index(fields=('sent', 'next_attempt'))]
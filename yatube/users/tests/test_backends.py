@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..backends import forget_user, user_key
+
+User = get_user_model()
+
+
+# Подписанная cookie не читает сессию из базы и не мешает считать запросы.
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+class CachedUserBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='User', password='old-password')
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:follow_unread')
+
+    def test_user_loaded_from_cache(self):
+        """Повторный запрос берёт пользователя из кэша."""
+        self.client.get(self.url)
+        self.assertIsNotNone(cache.get(user_key(self.user.pk)))
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_save_invalidates_cache(self):
+        """Сохранение пользователя сбрасывает запись в кэше."""
+        self.client.get(self.url)
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        self.assertIsNone(cache.get(user_key(self.user.pk)))
+
+    def test_model_backend_sessions_stay_valid(self):
+        """Сессии, открытые через ModelBackend, продолжают действовать."""
+        client = Client()
+        client.force_login(
+            self.user, backend='django.contrib.auth.backends.ModelBackend')
+        response = client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_bulk_update_needs_forget(self):
+        """После QuerySet.update() кэш сбрасывается через forget_user."""
+        self.client.get(self.url)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        forget_user(self.user.pk)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_password_change_logs_out(self):
+        """После смены пароля старая сессия перестаёт действовать."""
+        self.client.get(self.url)
+        self.user.set_password('new-password')
+        self.user.save()
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertRedirects(
+            response, reverse('users:login') + '?next='
+            + reverse('posts:follow_index'))
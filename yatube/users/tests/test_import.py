@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase
+
+User = get_user_model()
+
+
+class ImportUsersTests(TestCase):
+    def write(self, suffix, content):
+        descriptor, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as target:
+            target.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, path, **options):
+        out, self.err = StringIO(), StringIO()
+        call_command(
+            'import_users', path, stdout=out, stderr=self.err, **options)
+        return out.getvalue()
+
+    def test_import_csv(self):
+        """CSV импортируется, пароли хэшируются в пуле процессов."""
+        path = self.write('.csv', (
+            'username,email,password\n'
+            'anna,anna@example.com,secret-one\n'
+            'boris,,secret-two\n'
+            'bad name!,,secret\n'
+        ))
+        out = self.run_import(path, workers=2, batch=2)
+        self.assertIn('Импортировано: 2, пропущено: 1', out)
+        self.assertTrue(
+            User.objects.get(username='anna').check_password('secret-one'))
+        self.assertTrue(
+            User.objects.get(username='boris').check_password('secret-two'))
+
+    def test_import_jsonl_with_hashes(self):
+        """Готовые хэши сохраняются без повторного хэширования."""
+        hashed = make_password('ready')
+        path = self.write('.jsonl', '\n'.join(json.dumps(row) for row in (
+            {'username': 'vera', 'password_hash': hashed},
+            {'username': 'gleb'},
+        )))
+        self.run_import(path, workers=0)
+        self.assertEqual(User.objects.get(username='vera').password, hashed)
+        self.assertFalse(
+            User.objects.get(username='gleb').has_usable_password())
+
+    def test_existing_users_kept(self):
+        """Уже существующие имена не перезаписываются."""
+        User.objects.create_user(username='anna', password='old')
+        path = self.write('.csv', 'username,password\nanna,new\n')
+        out = self.run_import(path, workers=0)
+        self.assertIn('Импортировано: 0, пропущено: 1', out)
+        self.assertIn('пользователь уже есть', self.err.getvalue())
+        self.assertTrue(
+            User.objects.get(username='anna').check_password('old'))
+
+    def test_invalid_rows_rejected(self):
+        """Неизвестный формат хэша и повтор имени отклоняются."""
+        path = self.write('.jsonl', '\n'.join(json.dumps(row) for row in (
+            {'username': 'dina', 'password_hash': 'plain-text'},
+            {'username': 'egor', 'password': 'one'},
+            {'username': 'egor', 'password': 'two'},
+        )))
+        out = self.run_import(path, workers=0)
+        self.assertIn('Импортировано: 1, пропущено: 2', out)
+        self.assertIn('неизвестный формат хэша', self.err.getvalue())
+        self.assertIn('имя повторяется', self.err.getvalue())
+        self.assertFalse(User.objects.filter(username='dina').exists())
+        self.assertTrue(
+            User.objects.get(username='egor').check_password('one'))
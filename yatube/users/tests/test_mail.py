@@ -0,0 +1,126 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..mail import claim, deliver, queue_depth
+from ..models import OutboxEmail
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='users.mail.OutboxBackend',
+    OUTBOX_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    OUTBOX_RETRY_DELAY=60,
+)
+class OutboxTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username='User', email='user@example.com', password='password')
+
+    def request_reset(self):
+        return self.client.post(
+            reverse('users:password_reset'), {'email': 'user@example.com'})
+
+    def test_reset_enqueues_mail(self):
+        """Сброс пароля кладёт письмо в очередь, а не отправляет его."""
+        response = self.request_reset()
+        self.assertRedirects(response, reverse('users:password_reset_done'))
+        self.assertEqual(mail.outbox, [])
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, 'user@example.com')
+        self.assertEqual(queue_depth()['due'], 1)
+
+    def test_worker_sends_batch(self):
+        """Команда отправляет очередь и помечает письма."""
+        self.request_reset()
+        self.request_reset()
+        out = StringIO()
+        call_command('send_queued_mail', stdout=out)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn('Отправлено: 2', out.getvalue())
+        self.assertFalse(OutboxEmail.objects.filter(sent=None).exists())
+
+    def test_failed_mail_retried_later(self):
+        """Ошибка отправки откладывает письмо с растущей задержкой."""
+        self.request_reset()
+        with mock.patch(
+                'django.core.mail.EmailMessage.send',
+                side_effect=ConnectionError('SMTP недоступен')):
+            self.assertEqual(deliver(10), (0, 1))
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('SMTP недоступен', email.last_error)
+        self.assertGreater(email.next_attempt, email.created)
+        self.assertEqual(deliver(10), (0, 0))
+        self.assertEqual(queue_depth(), {'pending': 1, 'due': 0, 'failed': 0})
+
+    def test_connection_failure_recorded(self):
+        """Недоступный сервер записывает попытку для всей пачки."""
+        self.request_reset()
+        self.request_reset()
+        with mock.patch(
+                'django.core.mail.backends.locmem.EmailBackend.open',
+                side_effect=ConnectionError('SMTP недоступен')):
+            self.assertEqual(deliver(10), (0, 2))
+        for email in OutboxEmail.objects.all():
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.claim, '')
+            self.assertIn('SMTP недоступен', email.last_error)
+        self.assertEqual(queue_depth()['due'], 0)
+
+    def test_worker_survives_failed_batch(self):
+        """Сбой пачки не останавливает обработчик с --forever."""
+        calls = [RuntimeError('база недоступна'), (0, 0)]
+        sleeps = [None, KeyboardInterrupt]
+        with mock.patch(
+                'users.management.commands.send_queued_mail.deliver',
+                side_effect=calls) as deliver_mock, \
+                mock.patch('time.sleep', side_effect=sleeps):
+            err = StringIO()
+            with self.assertRaises(KeyboardInterrupt):
+                call_command(
+                    'send_queued_mail', forever=True,
+                    stdout=StringIO(), stderr=err)
+        self.assertIn('база недоступна', err.getvalue())
+        self.assertEqual(deliver_mock.call_count, 2)
+
+    def test_message_fields_preserved(self):
+        """Копии, скрытые копии, заголовки и вложения доходят как есть."""
+        message = EmailMultiAlternatives(
+            'Тема', 'Текст', 'noreply@example.com', ['to@example.com'],
+            cc=['cc@example.com'], bcc=['bcc@example.com'],
+            reply_to=['reply@example.com'], headers={'X-Tag': 'digest'})
+        message.attach_alternative('<p>Текст</p>', 'text/html')
+        message.attach('report.csv', 'a,b\n', 'text/csv')
+        message.send()
+        self.assertEqual(deliver(10), (1, 0))
+        delivered = mail.outbox[0].message()
+        self.assertEqual(delivered['To'], 'to@example.com')
+        self.assertEqual(delivered['Cc'], 'cc@example.com')
+        self.assertIsNone(delivered['Bcc'])
+        self.assertEqual(delivered['Reply-To'], 'reply@example.com')
+        self.assertEqual(delivered['X-Tag'], 'digest')
+        self.assertEqual(
+            mail.outbox[0].recipients(),
+            ['to@example.com', 'cc@example.com', 'bcc@example.com'])
+        self.assertEqual(
+            mail.outbox[0].attachments, [('report.csv', 'a,b\n', 'text/csv')])
+
+    def test_claimed_mail_not_taken_twice(self):
+        """Письма, забранные одним обработчиком, не достаются другому."""
+        self.request_reset()
+        self.request_reset()
+        first = claim(1)
+        second = claim(10)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].pk, second[0].pk)
+        self.assertEqual(claim(10), [])
+        self.assertEqual(queue_depth()['due'], 0)
@@ -1,5 +1,7 @@
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 SECRET_KEY = 'gh_7&%$j8zc+dwkvd(_p_9mgr*tk-9e68^&s6fqffg2keug*_u'
@@ -24,33 +26,49 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
     'sorl.thumbnail',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.PreloadMiddleware',
+    'core.middleware.TemplateTimingMiddleware',
+    'core.middleware.HoleMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
 
+TEMPLATE_CACHE = not DEBUG or os.getenv('YATUBE_TEMPLATE_CACHE') == '1'
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if TEMPLATE_CACHE:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.unread.unread',
             ],
         },
     },
@@ -92,12 +110,23 @@ USE_TZ = True
 
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 STATIC_URL = '/static/'
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+STATIC_PIPELINE = not DEBUG or os.getenv('YATUBE_STATIC_PIPELINE') == '1'
+if STATIC_PIPELINE:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    # Сессии, открытые до перехода на кэш, ссылаются на ModelBackend.
+    'django.contrib.auth.backends.ModelBackend',
+]
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'users.mail.OutboxBackend'
+OUTBOX_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 MEDIA_URL = '/media/'
@@ -111,5 +140,115 @@ CACHES = {
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('YATUBE_SESSIONS', 'db')]
+# cached_db допустим только с общим для всех процессов кэшем: LocMemCache
+# живёт в одном процессе, и выход или смена ключа сессии не доходят до
+# остальных, которые продолжают пускать по старой сессии.
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+if (SESSION_ENGINE == SESSION_ENGINES['cached_db']
+        and CACHES['default']['BACKEND'] in LOCAL_CACHE_BACKENDS):
+    raise ImproperlyConfigured(
+        'YATUBE_SESSIONS=cached_db требует общего кэша, например Redis '
+        'или Memcached.')
+
 # Custom constants:
 FIRST_PAGE_POSTS = 10
+API_MAX_LIMIT = 100
+API_CACHE_TIMEOUT = 20
+FEED_ITEMS = 20
+FEED_CACHE_TIMEOUT = 60 * 60
+FEED_STAMP_TIMEOUT = 10
+SITEMAP_CHUNK_SIZE = 5000
+SITEMAP_CACHE_TIMEOUT = 24 * 60 * 60
+FOLLOW_RECOMMENDATIONS = 5
+FOLLOW_GRAPH_SAMPLE = 100
+FOLLOW_GRAPH_TTL = 60 * 60
+FOLLOW_GRAPH_MAX_DELTA = 10000
+LEADERBOARD_SIZE = 10
+FOLLOW_IMPORT_LIMIT = 500
+# Отметки новых постов видны только процессу, где пост создан, поэтому
+# счётчики в остальных процессах устаревают не дольше чем на этот срок.
+UNREAD_CACHE_TIMEOUT = 30
+TRENDING_WEIGHTS = {'post': 1.0, 'comment': 3.0, 'follow': 2.0, 'view': 0.1}
+TRENDING_HALF_LIFE_HOURS = 12
+TRENDING_MIN_SCORE = 0.01
+TRENDING_WINDOW_DAYS = 7
+TRENDING_VIEW_BATCH = 100
+TRENDING_VIEW_FLUSH_SECONDS = 10
+RELATED_POSTS = 5
+RELATED_DIM = 2 ** 18
+RELATED_BATCH = 256
+RELATED_INDEX_PATH = os.getenv(
+    'YATUBE_RELATED_INDEX',
+    os.path.join(
+        os.path.expanduser('~'), '.cache', 'yatube', 'related_index.npz'),
+)
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+DUPLICATE_THRESHOLD = 0.8
+DUPLICATE_MIN_SHINGLES = 5
+GROUP_CACHE_TIMEOUT = 60 * 60
+GROUPS_CACHE_TIMEOUT = 60
+SESSION_SKIP_UNCHANGED = True
+SESSION_CLEANUP_BATCH = 1000
+# QuerySet.update() не шлёт сигналов: кэш пользователя живёт не дольше
+# этого срока, а массовые обновления должны вызывать forget_user.
+AUTH_USER_CACHE_TIMEOUT = 5 * 60
+OUTBOX_BATCH = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_LEASE = 5 * 60
+# forget_username чистит кэш только своего процесса: после переименования
+# остальные процессы могут вести старое имя на прежний id не дольше этого.
+USERNAME_CACHE_TIMEOUT = 60
+USER_IMPORT_BATCH = 1000
+TEMPLATE_PRECOMPILE = TEMPLATE_CACHE
+TEMPLATE_PROFILING = (
+    DEBUG or os.getenv('YATUBE_TEMPLATE_PROFILING') == '1')
+TEMPLATE_PROFILE_SIZE = 20
+STATIC_COMPRESS_EXTENSIONS = (
+    '.css', '.js', '.svg', '.ico', '.json', '.xml', '.txt', '.map',
+)
+STATIC_COMPRESS_LEVELS = {'gzip': 9, 'br': 11}
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+CSS_SOURCE = 'css/bootstrap.min.css'
+CSS_PURGED = 'css/bootstrap.purged.css'
+CSS_CRITICAL_TEMPLATES = (
+    'base.html', 'includes/header.html', 'includes/holes/header.html',
+)
+CSS_CRITICAL_OUTPUT = 'includes/critical_css.html'
+CSS_SAFELIST = (
+    'input', 'textarea', 'select', 'option', 'label',
+    'active', 'disabled', 'show', 'fade', 'collapsing', 'is-invalid',
+)
+COMPRESS_MIN_SIZE = 512
+COMPRESS_LEVELS = {'gzip': 6, 'br': 5}
+COMPRESS_CONTENT_TYPES = (
+    'text/html', 'text/css', 'text/plain', 'text/xml', 'text/javascript',
+    'application/json', 'application/javascript', 'application/xml',
+    'application/atom+xml', 'application/rss+xml', 'image/svg+xml',
+)
+COMPRESS_CSRF_PAGES = False
+PAGINATOR_ON_EACH_SIDE = 2
+PAGINATOR_ON_ENDS = 1
+PAGINATOR_COUNT_TIMEOUT = 5 * 60
+PAGINATOR_APPROXIMATE_FROM = 10000
+HOLES = {
+    'header': 'includes/holes/header.html',
+    'switcher': 'includes/holes/switcher.html',
+}
+# Картинки и иконки не блокируют рендер, их preload только отнимает
+# канал у стилей и скриптов.
+PRELOAD_TYPES = {'.css': 'style', '.js': 'script', '.woff2': 'font'}
+PRELOAD_MAX = 8
+PRELOAD_VIEW_TEMPLATES = 32
+LEADERBOARD_KEEP_DAYS = 7
+LEADERBOARD_KEEP_WEEKS = 4